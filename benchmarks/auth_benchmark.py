@@ -0,0 +1,39 @@
+# Micro-benchmark de autenticación por petición: jwt.decode en cada llamada vs caché de claims
+# Uso: python benchmarks/auth_benchmark.py [iteraciones]
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+import jwt
+from utils.security import SECRET_KEY, create_jwt_token, authorize, token_cache
+
+
+def decode_every_time(token: str) -> dict:
+    # Equivalente a lo que hacían los cuatro validadores antes de la caché
+    payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+    if payload.get("email") is None or not payload.get("active"):
+        raise RuntimeError("token inválido")
+    return payload
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    token = create_jwt_token("bench", "bench@example.com", True, True, "64b000000000000000000000")
+
+    token_cache.clear()
+    authorize(token, require_admin=True)
+
+    before = timeit.timeit(lambda: decode_every_time(token), number=iterations)
+    after = timeit.timeit(lambda: authorize(token, require_admin=True), number=iterations)
+
+    print(f"iteraciones: {iterations}")
+    print(f"jwt.decode por petición: {before / iterations * 1e6:8.2f} µs/petición")
+    print(f"claims cacheados:        {after / iterations * 1e6:8.2f} µs/petición")
+    print(f"mejora:                  {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Benchmark de GET /games/search sobre un catálogo sembrado (1M juegos por defecto)
+# Usa una base aparte (MONGO_BENCH_DB, por defecto <MONGO_DB_NAME>_bench); no toca la base real.
+# Uso: python benchmarks/search_benchmark.py [juegos] [--reseed]
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+os.environ["MONGO_DB_NAME"] = os.getenv("MONGO_BENCH_DB", f"{os.getenv('MONGO_DB_NAME', 'tienda')}_bench")
+
+from datetime import datetime
+from bson import ObjectId
+from utils.mongodb import get_collection, connect_to_mongo, close_mongo_connection
+from utils.indexes import INDEXES, sync_collection
+from utils.text import search_terms
+from controllers.games import search_games
+
+WORDS = [
+    "aventura", "dragón", "leyenda", "guerra", "mágico", "ciudad", "estrella", "océano",
+    "caballero", "pirata", "galaxia", "sombra", "reino", "fútbol", "carrera", "misión",
+    "héroe", "bosque", "tormenta", "castillo", "robot", "zombi", "isla", "fantasía"
+]
+STATUSES = ["demo", "oferta", "gratis", "completo"]
+QUERIES = [("dragon", False), ("leyenda reino", False), ("futbol", False), ("cas", True), ("guerra gal", True)]
+SEED_BATCH = 10_000
+
+
+def random_game(i: int, rng: random.Random) -> dict:
+    title = " ".join(rng.sample(WORDS, 3)).title() + f" {i}"
+    return {
+        "title": title,
+        "description": "Un juego de " + " y ".join(rng.sample(WORDS, 4)),
+        "release_date": datetime(rng.randint(2000, 2025), rng.randint(1, 12), 1),
+        "price": round(rng.uniform(0, 70), 2),
+        "developer_id": ObjectId("000000000000000000000000"),
+        "status": rng.choice(STATUSES),
+        "active": True,
+        "search_terms": search_terms(title),
+    }
+
+
+async def seed(total: int):
+    games = get_collection("games")
+    await games.drop()
+    rng = random.Random(42)
+    for start in range(0, total, SEED_BATCH):
+        batch = [random_game(i, rng) for i in range(start, min(start + SEED_BATCH, total))]
+        await games.insert_many(batch, ordered=False)
+    await sync_collection("games", INDEXES["games"])
+
+
+async def measure(q: str, prefix: bool, runs: int = 30) -> list:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await search_games(q, limit=20, prefix=prefix)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    total = int(args[0]) if args else 1_000_000
+    connect_to_mongo()
+    try:
+        games = get_collection("games")
+        if "--reseed" in sys.argv or await games.estimated_document_count() < total:
+            print(f"sembrando {total} juegos en {os.environ['MONGO_DB_NAME']}...")
+            await seed(total)
+        for q, prefix in QUERIES:
+            timings = await measure(q, prefix)
+            p95 = statistics.quantiles(timings, n=20)[18]
+            print(f"q={q!r:16} prefix={prefix!s:5} p50={statistics.median(timings):7.2f} ms  p95={p95:7.2f} ms")
+    finally:
+        close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
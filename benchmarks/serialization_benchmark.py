@@ -0,0 +1,64 @@
+# Coste de serialización por ítem en una página de 1000 juegos:
+# response_model (validación Pydantic + jsonable_encoder + json) vs FastJSONRoute (orjson directo)
+# Uso: python benchmarks/serialization_benchmark.py [repeticiones]
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from models.games import GamePaginatedResponse
+from utils.repository import to_api
+from utils.responses import BSONJSONResponse, apply_shape, model_shape
+
+PAGE_SIZE = 1000
+
+
+def build_page():
+    developer_id = str(ObjectId())
+    docs = [
+        {
+            "_id": ObjectId(),
+            "title": f"Juego {i}",
+            "description": "Descripción de prueba para el benchmark",
+            "release_date": datetime(2024, 10, 1),
+            "price": 19.99,
+            "developer_id": developer_id,
+            "status": "completo",
+            "active": True,
+        }
+        for i in range(PAGE_SIZE)
+    ]
+    return {"games": [to_api(doc) for doc in docs], "total": PAGE_SIZE, "skip": 0, "limit": PAGE_SIZE}
+
+
+def pydantic_path(page):
+    validated = GamePaginatedResponse.model_validate(page)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast_path(page, shape):
+    return BSONJSONResponse(apply_shape(page, shape)).body
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    page = build_page()
+    shape = model_shape(GamePaginatedResponse)
+
+    before = timeit.timeit(lambda: pydantic_path(page), number=repeat)
+    after = timeit.timeit(lambda: fast_path(page, shape), number=repeat)
+
+    per_item = lambda total: total / repeat / PAGE_SIZE * 1e6
+    print(f"página de {PAGE_SIZE} juegos, {repeat} repeticiones")
+    print(f"response_model + jsonable_encoder: {per_item(before):8.2f} µs/ítem")
+    print(f"FastJSONRoute (orjson):            {per_item(after):8.2f} µs/ítem")
+    print(f"mejora:                            {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
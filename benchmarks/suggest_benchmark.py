@@ -0,0 +1,59 @@
+# Benchmark del índice de sugerencias en memoria: tiempo de carga, memoria y latencia por prefijo
+# No necesita MongoDB: usa títulos sintéticos.
+# Uso: python benchmarks/suggest_benchmark.py [juegos]
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.prefix_index import PrefixIndex
+
+WORDS = [
+    "aventura", "dragón", "leyenda", "guerra", "mágico", "ciudad", "estrella", "océano",
+    "caballero", "pirata", "galaxia", "sombra", "reino", "fútbol", "carrera", "misión",
+    "héroe", "bosque", "tormenta", "castillo", "robot", "zombi", "isla", "fantasía"
+]
+PREFIXES = ["d", "dr", "drag", "leyenda re", "cas", "zombi isla", "xyz"]
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(42)
+    items = [
+        (f"{i:024x}", " ".join(rng.sample(WORDS, 3)).title() + f" {i}", rng.randint(0, 10_000))
+        for i in range(total)
+    ]
+
+    index = PrefixIndex()
+    started = time.perf_counter()
+    index.load(items)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    # Segunda carga con tracemalloc para contrastar la estimación con getsizeof
+    tracemalloc.start()
+    traced_index = PrefixIndex()
+    traced_index.load(items)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = index.stats()
+    print(f"{stats['items']} títulos, {stats['keys']} claves, carga {load_ms:.0f} ms")
+    print(f"memoria: getsizeof={stats['bytes'] / 1_048_576:.1f} MB  tracemalloc={traced / 1_048_576:.1f} MB")
+
+    for prefix in PREFIXES:
+        timings = []
+        for run in range(30):
+            if run % 10 == 0:
+                index.set_popularity(items[0][0], run)  # invalida el top-k de prefijos cortos
+            started = time.perf_counter()
+            index.suggest(prefix, 10)
+            timings.append((time.perf_counter() - started) * 1000)
+        p95 = statistics.quantiles(timings, n=20)[18]
+        print(f"prefix={prefix!r:14} p50={statistics.median(timings):7.3f} ms  p95={p95:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from pymongo import ReturnDocument, DESCENDING
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from pipelines.purchases_pipelines import (
+    SALES_BY_GAME, SALES_BY_DEVELOPER, SALES_DAILY, sales_rollup_pipelines
+)
+from utils.repository import MongoRepository
+
+logger = logging.getLogger(__name__)
+
+# Intervalo del refresco automático (0 lo desactiva; queda el endpoint y el script)
+REFRESH_SECONDS = float(os.getenv("SALES_ROLLUP_REFRESH_SECONDS", "300"))
+# Margen para checkouts en curso: created_at se fija antes del commit de la transacción
+ROLLUP_LAG = timedelta(seconds=int(os.getenv("SALES_ROLLUP_LAG_SECONDS", "30")))
+ROLLUP_LEASE = timedelta(seconds=int(os.getenv("SALES_ROLLUP_LEASE_SECONDS", "600")))
+
+WATERMARK_ID = "sales_rollups"
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+purchases_repo = MongoRepository("purchases")
+watermarks_repo = MongoRepository("rollup_watermarks")
+sales_by_game_repo = MongoRepository(SALES_BY_GAME)
+sales_by_developer_repo = MongoRepository(SALES_BY_DEVELOPER)
+sales_daily_repo = MongoRepository(SALES_DAILY)
+
+def _now():
+    return datetime.now(timezone.utc)
+
+# Mongo devuelve las fechas sin zona horaria (en UTC)
+def _utc(value):
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+# Un solo refresco a la vez entre todos los procesos (lease en el documento de la marca de agua)
+async def _acquire():
+    now = _now()
+    try:
+        return await watermarks_repo.collection.find_one_and_update(
+            {"_id": WATERMARK_ID, "$or": [{"locked_until": None}, {"locked_until": {"$lt": now}}]},
+            {"$set": {"locked_until": now + ROLLUP_LEASE}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        return None
+
+# Aplicar a los rollups solo las compras y reembolsos posteriores a la marca de agua
+async def refresh_sales_rollups() -> dict:
+    state = await _acquire()
+    if state is None:
+        return {"refreshed": False, "detail": "Ya hay un refresco en curso"}
+
+    start = _utc(state.get("created_at")) or EPOCH
+    # Una ventana interrumpida se repite igual: el id del refresco evita sumar dos veces
+    end = _utc(state.get("pending_until")) or _now() - ROLLUP_LAG
+    if end <= start:
+        await watermarks_repo.collection.update_one({"_id": WATERMARK_ID}, {"$set": {"locked_until": None}})
+        return {"refreshed": False, "from": start, "to": start}
+
+    await watermarks_repo.collection.update_one({"_id": WATERMARK_ID}, {"$set": {"pending_until": end}})
+    for pipeline in sales_rollup_pipelines(start, end):
+        await purchases_repo.aggregate(pipeline, raw=True)
+    await watermarks_repo.collection.update_one(
+        {"_id": WATERMARK_ID},
+        {"$set": {"created_at": end, "refreshed_at": _now(), "locked_until": None}, "$unset": {"pending_until": ""}}
+    )
+    return {"refreshed": True, "from": start, "to": end}
+
+async def _refresher():
+    while True:
+        await asyncio.sleep(REFRESH_SECONDS)
+        try:
+            result = await refresh_sales_rollups()
+            if result["refreshed"]:
+                logger.info("Rollups de ventas actualizados hasta %s", result["to"])
+        except PyMongoError as e:
+            # La ventana queda en pending_until y se repite cuando vence el lease
+            logger.error("Error refrescando los rollups de ventas: %s", e)
+
+def start_rollup_refresher():
+    if REFRESH_SECONDS <= 0:
+        return None
+    return asyncio.create_task(_refresher())
+
+async def stop_rollup_refresher(task):
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except (asyncio.CancelledError, PyMongoError):
+        pass
+
+async def _rollup_state():
+    state = await watermarks_repo.find_one({"_id": WATERMARK_ID}, raw=True) or {}
+    return {"up_to": state.get("created_at"), "refreshed_at": state.get("refreshed_at")}
+
+# Lecturas del panel: solo las colecciones de rollup (pequeñas), nunca purchases
+async def top_games(limit: int = 20):
+    projection = {"_id": 0, "game_id": "$_id", "title": 1, "developer_id": 1, "units": 1, "revenue": 1}
+    games = await sales_by_game_repo.find_many({}, projection, sort=[("revenue", DESCENDING)], limit=limit)
+    return {"games": games, **await _rollup_state()}
+
+async def top_developers(limit: int = 20):
+    projection = {"_id": 0, "developer_id": "$_id", "units": 1, "revenue": 1}
+    developers = await sales_by_developer_repo.find_many({}, projection, sort=[("revenue", DESCENDING)], limit=limit)
+    return {"developers": developers, **await _rollup_state()}
+
+async def daily_sales(start, end):
+    if end < start:
+        raise HTTPException(status_code=400, detail="La fecha final no puede ser anterior a la fecha de inicio")
+    query = {"_id": {
+        "$gte": datetime(start.year, start.month, start.day),
+        "$lte": datetime(end.year, end.month, end.day)
+    }}
+    projection = {"_id": 0, "day": "$_id", "units": 1, "revenue": 1}
+    days = await sales_daily_repo.find_many(query, projection, sort=[("_id", 1)])
+    return {"days": days, **await _rollup_state()}
@@ -1,13 +1,34 @@
+import asyncio
 from fastapi import HTTPException
 from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from models.contracts import Contract
-from utils.mongodb import get_collection
-from pipelines.contracts_pipelines import check_existing_active_contract_pipeline  
+from utils.repository import MongoRepository, to_object_id
+from utils.pagination import paginate
+from utils.export import export_response
+from pipelines.contracts_pipelines import CONTRACT_DETAILS_PROJECTION
+from controllers.games import find_game
+from controllers.developers import find_developer
 
-contracts_collection = get_collection("contracts")
-developers_collection = get_collection("developers")
-games_collection = get_collection("games")
-contract_types_collection = get_collection("contract_types")
+contracts_repo = MongoRepository("contracts")
+developers_repo = MongoRepository("developers")
+games_repo = MongoRepository("games")
+contract_types_repo = MongoRepository("contract_types")
+
+CONTRACT_EXPORT_FIELDS = list(Contract.model_fields)
+
+# Referencias que se guardan como ObjectId nativo
+CONTRACT_REFS = ("developer_id", "game_id", "type_contract_id")
+
+# Copias de presentación (las mantiene controllers/display_fields.py)
+CONTRACT_DISPLAY_FIELDS = ("developer_name", "game_title", "contract_type_description")
+
+# La regla la garantiza el índice único parcial developer_game_active (utils/indexes.py)
+DUPLICATE_ACTIVE_CONTRACT = "Ya existe un contrato activo para este desarrollador y juego."
+DUPLICATE_KEY_CODE = 11000
+
+def _with_object_ids(data: dict) -> dict:
+    return {k: to_object_id(v) if k in CONTRACT_REFS else v for k, v in data.items()}
 
 async def create_contract(contract: Contract):
     # Validar IDs válidos
@@ -15,22 +36,22 @@ async def create_contract(contract: Contract):
         if not ObjectId.is_valid(id_field):
             raise HTTPException(status_code=400, detail=f"ID inválido: {id_field}")
 
+    # Las consultas son independientes: se lanzan en paralelo
+    developer, game, contract_type = await asyncio.gather(
+        find_developer(contract.developer_id),
+        find_game(contract.game_id),
+        contract_types_repo.find_by_id(contract.type_contract_id, {"active": True}, {"_id": 1, "description": 1})
+    )
+
     # Validar developer activo
-    developer = developers_collection.find_one({"_id": ObjectId(contract.developer_id), "active": True})
-    if not developer:
+    if not developer or not developer.get("active"):
         raise HTTPException(status_code=400, detail="Desarrollador no válido o inactivo")
 
     # Validar juego activo y pertenece al developer
-    game = games_collection.find_one({
-        "_id": ObjectId(contract.game_id),
-        "active": True,
-        "developer_id": contract.developer_id
-    })
-    if not game:
+    if not game or not game.get("active") or str(game.get("developer_id")) != str(contract.developer_id):
         raise HTTPException(status_code=400, detail="Juego no válido, inactivo o no pertenece al desarrollador")
 
     # Validar tipo de contrato activo
-    contract_type = contract_types_collection.find_one({"_id": ObjectId(contract.type_contract_id), "active": True})
     if not contract_type:
         raise HTTPException(status_code=400, detail="Tipo de contrato inválido o inactivo")
 
@@ -38,69 +59,162 @@ async def create_contract(contract: Contract):
     if contract.end_date and contract.end_date < contract.start_date:
         raise HTTPException(status_code=400, detail="La fecha final no puede ser anterior a la fecha de inicio")
 
-    # === Validación compleja con pipeline: No permitir contratos activos duplicados ===
-    pipeline = check_existing_active_contract_pipeline(contract.developer_id, contract.game_id)
-    existing_contracts = list(contracts_collection.aggregate(pipeline))
-    if existing_contracts and existing_contracts[0].get("existing_contracts", 0) > 0:
-        raise HTTPException(
-            status_code=400,
-            detail="Ya existe un contrato activo para este desarrollador y juego."
-        )
-    # === Fin validación pipeline ===
-
-    # Insertar contrato
-    contract_dict = contract.model_dump(exclude_unset=True)
-    result = contracts_collection.insert_one(contract_dict)
-    contract.id = str(result.inserted_id)
+    # Insertar contrato (el índice rechaza un segundo contrato activo para el mismo par)
+    # Copias de presentación: el listado con detalles no necesita $lookup
+    contract.developer_name = developer.get("name")
+    contract.game_title = game.get("title")
+    contract.contract_type_description = contract_type.get("description")
+    contract_dict = _with_object_ids(contract.model_dump(exclude={"id"}))
+    try:
+        contract.id = await contracts_repo.insert_one(contract_dict)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail=DUPLICATE_ACTIVE_CONTRACT)
     return contract
 
+def _bulk_error(contract: Contract, detail: str) -> dict:
+    return {"developer_id": contract.developer_id, "game_id": contract.game_id, "status": "error", "detail": detail}
+
+# Alta masiva: un $in por colección referenciada y un insert_many (duplicados por el índice único)
+async def create_contracts_bulk(contracts: list) -> dict:
+    results = [None] * len(contracts)
 
-async def list_contracts(skip: int = 0, limit: int = 10):
-    cursor = contracts_collection.find({"active": True}).skip(skip).limit(limit)
-    contracts = []
-    for doc in cursor:
-        doc['id'] = str(doc['_id'])
-        del doc['_id']
-        contracts.append(Contract(**doc))
-    total = contracts_collection.count_documents({"active": True})
+    for i, contract in enumerate(contracts):
+        invalid = next(
+            (v for v in (contract.developer_id, contract.game_id, contract.type_contract_id) if not ObjectId.is_valid(v)),
+            None
+        )
+        if invalid is not None:
+            results[i] = _bulk_error(contract, f"ID inválido: {invalid}")
+        elif contract.end_date and contract.end_date < contract.start_date:
+            results[i] = _bulk_error(contract, "La fecha final no puede ser anterior a la fecha de inicio")
+
+    pending = [i for i in range(len(contracts)) if results[i] is None]
+    developer_ids = list({ObjectId(contracts[i].developer_id) for i in pending})
+    game_ids = list({ObjectId(contracts[i].game_id) for i in pending})
+    type_ids = list({ObjectId(contracts[i].type_contract_id) for i in pending})
+
+    developers, games, contract_types = await asyncio.gather(
+        developers_repo.find_many({"_id": {"$in": developer_ids}, "active": True}, {"_id": 1, "name": 1}, raw=True),
+        games_repo.find_many({"_id": {"$in": game_ids}, "active": True}, {"_id": 1, "developer_id": 1, "title": 1}, raw=True),
+        contract_types_repo.find_many({"_id": {"$in": type_ids}, "active": True}, {"_id": 1, "description": 1}, raw=True)
+    )
+    developer_names = {str(doc["_id"]): doc.get("name") for doc in developers}
+    game_owner = {str(doc["_id"]): str(doc.get("developer_id")) for doc in games}
+    game_titles = {str(doc["_id"]): doc.get("title") for doc in games}
+    type_descriptions = {str(doc["_id"]): doc.get("description") for doc in contract_types}
+
+    to_insert = []
+    for i in pending:
+        contract = contracts[i]
+        if contract.developer_id not in developer_names:
+            results[i] = _bulk_error(contract, "Desarrollador no válido o inactivo")
+        elif game_owner.get(contract.game_id) != str(contract.developer_id):
+            results[i] = _bulk_error(contract, "Juego no válido, inactivo o no pertenece al desarrollador")
+        elif contract.type_contract_id not in type_descriptions:
+            results[i] = _bulk_error(contract, "Tipo de contrato inválido o inactivo")
+        else:
+            to_insert.append(i)
+
+    docs = [
+        _with_object_ids({
+            **contracts[i].model_dump(exclude={"id"}),
+            "developer_name": developer_names[contracts[i].developer_id],
+            "game_title": game_titles[contracts[i].game_id],
+            "contract_type_description": type_descriptions[contracts[i].type_contract_id]
+        })
+        for i in to_insert
+    ]
+    failed = {}
+    if docs:
+        try:
+            await contracts_repo.insert_many(docs)
+        except BulkWriteError as e:
+            failed = {err["index"]: err.get("code") for err in e.details.get("writeErrors", [])}
+
+    for pos, i in enumerate(to_insert):
+        if pos in failed:
+            detail = DUPLICATE_ACTIVE_CONTRACT if failed[pos] == DUPLICATE_KEY_CODE else "Error en base de datos"
+            results[i] = _bulk_error(contracts[i], detail)
+        else:
+            results[i] = {
+                "developer_id": contracts[i].developer_id,
+                "game_id": contracts[i].game_id,
+                "status": "created",
+                "id": str(docs[pos]["_id"])
+            }
+
+    created = sum(1 for r in results if r["status"] == "created")
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }
+
+
+async def list_contracts(skip: int = 0, limit: int = 10, cursor: str = None, total_mode: str = "exact"):
+    contracts, total, next_cursor = await paginate(contracts_repo, {"active": True}, skip, limit, cursor, total_mode)
     return {
         "contracts": contracts,
         "total": total,
         "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor
+    }
+
+# Contratos con nombre del desarrollador, título del juego y descripción del tipo
+async def list_contracts_with_details(skip: int = 0, limit: int = 10):
+    # Los nombres están copiados en el contrato: un find sobre el índice active_id, sin $lookup
+    contracts = await contracts_repo.find_many(
+        {"active": True}, CONTRACT_DETAILS_PROJECTION, sort=[("_id", 1)], skip=skip, limit=limit, batch_size=limit
+    )
+    return {
+        "contracts": contracts,
+        "skip": skip,
         "limit": limit
     }
 
 async def get_contract_by_id(contract_id: str):
     if not ObjectId.is_valid(contract_id):
         raise HTTPException(status_code=400, detail="ID inválido")
-    doc = contracts_collection.find_one({"_id": ObjectId(contract_id)})
+    doc = await contracts_repo.find_by_id(contract_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Contrato no encontrado")
-    doc['id'] = str(doc['_id'])
-    del doc['_id']
     return Contract(**doc)
 
 async def update_contract(contract_id: str, contract_data: dict):
     if not ObjectId.is_valid(contract_id):
         raise HTTPException(status_code=400, detail="ID inválido")
 
+    # Las copias de presentación no se editan a mano: se toman de la referencia nueva
+    contract_data = {k: v for k, v in contract_data.items() if k not in CONTRACT_DISPLAY_FIELDS}
+
     if "developer_id" in contract_data:
-        if not ObjectId.is_valid(contract_data["developer_id"]) or not developers_collection.find_one({"_id": ObjectId(contract_data["developer_id"]), "active": True}):
+        developer = await developers_repo.find_by_id(contract_data["developer_id"], {"active": True}, {"name": 1}, raw=True)
+        if not ObjectId.is_valid(contract_data["developer_id"]) or not developer:
             raise HTTPException(status_code=400, detail="Desarrollador inválido o inactivo")
+        contract_data["developer_name"] = developer.get("name")
 
     if "game_id" in contract_data:
-        if not ObjectId.is_valid(contract_data["game_id"]) or not games_collection.find_one({"_id": ObjectId(contract_data["game_id"]), "active": True, "developer_id": contract_data.get("developer_id", None)}):
+        game = await games_repo.find_by_id(contract_data["game_id"], {"active": True, "developer_id": to_object_id(contract_data.get("developer_id"))}, {"title": 1}, raw=True)
+        if not ObjectId.is_valid(contract_data["game_id"]) or not game:
             raise HTTPException(status_code=400, detail="Juego inválido, inactivo o no pertenece al desarrollador")
+        contract_data["game_title"] = game.get("title")
 
     if "type_contract_id" in contract_data:
-        if not ObjectId.is_valid(contract_data["type_contract_id"]) or not contract_types_collection.find_one({"_id": ObjectId(contract_data["type_contract_id"]), "active": True}):
+        contract_type = await contract_types_repo.find_by_id(contract_data["type_contract_id"], {"active": True}, {"description": 1}, raw=True)
+        if not ObjectId.is_valid(contract_data["type_contract_id"]) or not contract_type:
             raise HTTPException(status_code=400, detail="Tipo de contrato inválido o inactivo")
+        contract_data["contract_type_description"] = contract_type.get("description")
 
     if "start_date" in contract_data and "end_date" in contract_data:
         if contract_data["end_date"] and contract_data["end_date"] < contract_data["start_date"]:
             raise HTTPException(status_code=400, detail="La fecha final no puede ser anterior a la fecha de inicio")
 
-    result = contracts_collection.update_one({"_id": ObjectId(contract_id)}, {"$set": contract_data})
+    # Cambiar el par o reactivar un contrato pasa por el mismo índice único
+    try:
+        result = await contracts_repo.update_by_id(contract_id, _with_object_ids(contract_data))
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail=DUPLICATE_ACTIVE_CONTRACT)
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Contrato no encontrado")
 
@@ -109,7 +223,11 @@ async def update_contract(contract_id: str, contract_data: dict):
 async def disable_contract(contract_id: str):
     if not ObjectId.is_valid(contract_id):
         raise HTTPException(status_code=400, detail="ID inválido")
-    result = contracts_collection.update_one({"_id": ObjectId(contract_id)}, {"$set": {"active": False}})
+    result = await contracts_repo.update_by_id(contract_id, {"active": False})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Contrato no encontrado")
     return {"message": "Contrato desactivado"}
+
+# Exportar contratos activos en streaming (NDJSON o CSV)
+async def export_contracts(fmt: str = "ndjson", batch_size: int = 500):
+    return export_response(contracts_repo, {"active": True}, CONTRACT_EXPORT_FIELDS, fmt, batch_size, "contracts")
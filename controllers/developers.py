@@ -0,0 +1,61 @@
+from fastapi import HTTPException
+from bson import ObjectId
+from models.developers import Developer
+from utils.repository import MongoRepository
+from utils.cache import developers_cache
+from controllers.display_fields import schedule_propagation
+
+developers_repo = MongoRepository("developers")
+
+# Lectura de un desarrollador por ID a través de la caché (sin validar el ID)
+async def find_developer(dev_id: str):
+    return await developers_cache.get(dev_id, lambda: developers_repo.find_by_id(dev_id))
+
+# Crear desarrollador
+async def create_developer(developer: Developer):
+    dev_dict = developer.model_dump(exclude={"id"})
+    developer.id = await developers_repo.insert_one(dev_dict)
+    return developer
+
+# Listar desarrolladores activos con paginación
+async def list_developers(skip: int = 0, limit: int = 10):
+    developers = await developers_repo.find_many({"active": True}, skip=skip, limit=limit)
+    total = await developers_repo.count({"active": True})
+    return {
+        "developers": developers,
+        "total": total,
+        "skip": skip,
+        "limit": limit
+    }
+
+# Obtener desarrollador por ID
+async def get_developer_by_id(dev_id: str):
+    if not ObjectId.is_valid(dev_id):
+        raise HTTPException(status_code=400, detail="ID inválido")
+    developer = await find_developer(dev_id)
+    if not developer:
+        raise HTTPException(status_code=404, detail="Desarrollador no encontrado")
+    return developer
+
+# Actualizar desarrollador
+async def update_developer(dev_id: str, dev_data: dict):
+    if not ObjectId.is_valid(dev_id):
+        raise HTTPException(status_code=400, detail="ID inválido")
+    result = await developers_repo.update_by_id(dev_id, dev_data)
+    developers_cache.invalidate(dev_id)
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Desarrollador no encontrado")
+    # Juegos y contratos guardan una copia del nombre: se actualiza en segundo plano
+    if "name" in dev_data and result.modified_count:
+        schedule_propagation("developers", "name", dev_id)
+    return {"message": "Desarrollador actualizado correctamente"}
+
+# Desactivar desarrollador
+async def disable_developer(dev_id: str):
+    if not ObjectId.is_valid(dev_id):
+        raise HTTPException(status_code=400, detail="ID inválido")
+    result = await developers_repo.update_by_id(dev_id, {"active": False})
+    developers_cache.invalidate(dev_id)
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Desarrollador no encontrado")
+    return {"message": "Desarrollador desactivado"}
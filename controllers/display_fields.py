@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+from pipelines.display_fields_pipelines import display_copies_pipeline
+from utils.repository import MongoRepository, bump_collection_version, to_object_id
+from utils.cache import CACHE_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Campos de presentación copiados en otros documentos para no hacer $lookup al leer:
+# (colección de origen, campo) -> [(colección destino, referencia, campo embebido)]
+DISPLAY_COPIES = {
+    ("developers", "name"): [
+        ("contracts", "developer_id", "developer_name"),
+        ("games", "developer_id", "developer_name"),
+    ],
+    ("games", "title"): [
+        ("contracts", "game_id", "game_title"),
+    ],
+    ("contract_types", "description"): [
+        ("contracts", "type_contract_id", "contract_type_description"),
+    ],
+}
+
+SOURCE_REPOS = {name: MongoRepository(name) for name, _ in DISPLAY_COPIES}
+TARGET_REPOS = {
+    "contracts": MongoRepository("contracts"),
+    "games": MongoRepository("games", versioned=True),
+}
+
+# Tareas de propagación en curso (referencia fuerte hasta que terminan; se esperan al apagar)
+_pending = set()
+
+def _invalidate(target: str):
+    if target in CACHE_REGISTRY:
+        CACHE_REGISTRY[target].clear()
+
+# Reescribir las copias con el valor actual del origen (no con el del request): si dos cambios
+# se propagan en desorden, ambos escriben el último valor
+async def propagate_display_field(source: str, field: str, source_id: str):
+    doc = await SOURCE_REPOS[source].find_by_id(source_id, projection={field: 1}, raw=True)
+    value = doc.get(field) if doc else None
+    for target, ref, embedded in DISPLAY_COPIES[(source, field)]:
+        result = await TARGET_REPOS[target].update_many(
+            {ref: to_object_id(source_id), embedded: {"$ne": value}},
+            {"$set": {embedded: value}}
+        )
+        if result.modified_count:
+            _invalidate(target)
+            logger.info(f"{target}.{embedded} actualizado en {result.modified_count} documentos")
+
+async def _propagate(source: str, field: str, source_id: str):
+    try:
+        await propagate_display_field(source, field, source_id)
+    except PyMongoError as e:
+        logger.error(f"No se pudo propagar {source}.{field} de {source_id} (lo corregirá el verificador): {e}")
+
+# Lanzar la propagación sin hacer esperar al request que cambió el nombre
+def schedule_propagation(source: str, field: str, source_id: str):
+    task = asyncio.create_task(_propagate(source, field, source_id))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+    return task
+
+async def drain_propagations(timeout: float = 10):
+    if _pending:
+        await asyncio.wait(list(_pending), timeout=timeout)
+
+# Verificador: recorre cada colección destino por lotes de _id y compara cada copia con su origen;
+# con repair=True corrige las diferencias (solo si la copia no cambió mientras tanto)
+async def check_display_copies(repair: bool = False, batch_size: int = 500) -> dict:
+    report = {}
+    for (source, field), copies in DISPLAY_COPIES.items():
+        for target, ref, embedded in copies:
+            repo = TARGET_REPOS[target]
+            checked, stale, last_id = 0, 0, None
+            while True:
+                pipeline = display_copies_pipeline(source, field, ref, embedded, last_id, batch_size)
+                batch = await repo.aggregate(pipeline, batch_size=batch_size, raw=True)
+                if not batch:
+                    break
+                fixes = [doc for doc in batch if doc["current"] != doc["expected"]]
+                if fixes and repair:
+                    # _update_doc añade version/updated_at en las colecciones versionadas (ETags por documento)
+                    await repo.collection.bulk_write([
+                        UpdateOne(
+                            {"_id": doc["_id"], embedded: doc["current"]},
+                            repo._update_doc({"$set": {embedded: doc["expected"]}})
+                        )
+                        for doc in fixes
+                    ], ordered=False)
+                checked += len(batch)
+                stale += len(fixes)
+                last_id = batch[-1]["_id"]
+            if stale and repair:
+                _invalidate(target)
+                if repo.versioned:
+                    await bump_collection_version(target)
+            report[f"{target}.{embedded}"] = {"checked": checked, "stale": stale}
+    return {"repair": repair, "copies": report}
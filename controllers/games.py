@@ -1,63 +1,272 @@
+import os
+from datetime import datetime
 from fastapi import HTTPException
 from bson import ObjectId
-from models.games import Game
-from utils.mongodb import get_collection
+from pymongo.errors import DuplicateKeyError
+from models.games import Game, GamePaginatedResponse
+from pipelines.search_pipelines import search_games_pipeline
+from pipelines.games_pipelines import (
+    DEFAULT_PRICE_BOUNDARIES,
+    browse_games_pipeline,
+    price_boundaries_pipeline
+)
+from utils.repository import MongoRepository, collection_version, to_api, to_object_id
+from utils.pagination import paginate, encode_cursor, decode_cursor_values
+from utils.text import WORD, fold, search_terms
+from utils.export import export_response
+from utils.cache import games_cache, ReadThroughCache
+from utils.etag import make_etag, etag_matches, cache_headers, not_modified
+from utils.responses import model_response
+from utils.prefix_index import game_suggestions
+from utils.change_streams import register_listener
+from controllers.notifications import enqueue_price_drop
+from controllers.developers import find_developer
+from controllers.display_fields import schedule_propagation
 
-games_collection = get_collection("Games")
+games_repo = MongoRepository("games", versioned=True)
+
+GAME_EXPORT_FIELDS = list(Game.model_fields)
+
+# Los rangos de precio de /games/browse se recalculan como mucho una vez por TTL
+PRICE_BUCKETS_TTL = float(os.getenv("PRICE_BUCKETS_TTL_SECONDS", "3600"))
+price_buckets_cache = ReadThroughCache("game_price_buckets", maxsize=1, ttl=PRICE_BUCKETS_TTL)
+
+# La popularidad solo ordena las sugerencias: no forma parte del modelo Game (ni de sus ETags)
+SUGGEST_PROJECTION = {"title": 1, "popularity": 1}
+
+# Cargar el índice de sugerencias con los títulos activos (al arrancar)
+async def load_suggestions():
+    items = [
+        (str(doc["_id"]), doc.get("title", ""), doc.get("popularity", 0))
+        async for doc in games_repo.iterate({"active": True}, SUGGEST_PROJECTION, batch_size=5000, raw=True)
+    ]
+    game_suggestions.load(items)
+    return game_suggestions.stats()
+
+# Releer un juego y reflejarlo en el índice de sugerencias (alta, cambio de título o baja)
+async def refresh_suggestion(game_id: str):
+    game = await games_repo.find_by_id(game_id, {"active": True}, SUGGEST_PROJECTION, raw=True)
+    if game is None:
+        game_suggestions.remove(game_id)
+    else:
+        game_suggestions.add(game_id, game.get("title", ""), game.get("popularity", 0))
+
+async def _on_game_change(event: dict):
+    document_key = event.get("documentKey") or {}
+    if "_id" in document_key:
+        await refresh_suggestion(str(document_key["_id"]))
+
+# Los cambios hechos por otros workers llegan por change stream
+register_listener("games", _on_game_change)
+
+# Lectura de un juego por ID a través de la caché (sin validar el ID)
+async def find_game(game_id: str):
+    return await games_cache.get(game_id, lambda: games_repo.find_by_id(game_id))
 
 # Crear juego
 async def create_game(game: Game):
-    # Validar si ya existe un juego con el mismo título (ignorando mayúsculas/minúsculas)
-    existing_game = games_collection.find_one({"title": {"$regex": f"^{game.title}$", "$options": "i"}})
-    if existing_game:
+    if not ObjectId.is_valid(game.developer_id):
+        raise HTTPException(status_code=400, detail=f"ID inválido: {game.developer_id}")
+    # El índice único title_unique_ci rechaza títulos repetidos (ignorando mayúsculas/minúsculas)
+    developer = await find_developer(game.developer_id)
+    game.developer_name = developer.get("name") if developer else None
+    game_dict = game.model_dump(exclude={"id"})
+    game_dict["developer_id"] = ObjectId(game.developer_id)
+    game_dict["search_terms"] = search_terms(game.title)
+    try:
+        game.id = await games_repo.insert_one(game_dict)
+    except DuplicateKeyError:
         raise HTTPException(status_code=400, detail="Ya existe un juego con este título")
-
-    game_dict = game.model_dump(exclude_unset=True)
-    result = games_collection.insert_one(game_dict)
-    game.id = str(result.inserted_id)
+    if game.active:
+        game_suggestions.add(game.id, game.title, 0)
     return game
 
 # Obtener todos los juegos activos con paginación
-async def list_games(skip: int = 0, limit: int = 10):
-    games_cursor = games_collection.find({"active": True}).skip(skip).limit(limit)
-    games = [{**game, "id": str(game["_id"])} for game in games_cursor]
-    total = games_collection.count_documents({"active": True})
+async def list_games(skip: int = 0, limit: int = 10, cursor: str = None, total_mode: str = "exact"):
+    games, total, next_cursor = await paginate(games_repo, {"active": True}, skip, limit, cursor, total_mode)
     return {
         "games": games,
         "total": total,
         "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor
     }
 
 # Obtener juego por ID con validación de ObjectId
 async def get_game_by_id(game_id: str):
     if not ObjectId.is_valid(game_id):
         raise HTTPException(status_code=400, detail="ID inválido")
-    game = games_collection.find_one({"_id": ObjectId(game_id)})
+    game = await find_game(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Juego no encontrado")
-    return {**game, "id": str(game["_id"])}
+    return game
+
+# Listado con ETag por versión de la colección: si no cambió, 304 sin leer la página ni serializar
+async def list_games_conditional(if_none_match: str, skip: int = 0, limit: int = 10,
+                                 cursor: str = None, total_mode: str = "exact"):
+    version = await collection_version("games")
+    etag = make_etag("games", version, skip, limit, cursor, total_mode)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    content = await list_games(skip, limit, cursor, total_mode)
+    return model_response(content, GamePaginatedResponse, headers=cache_headers(etag))
+
+# Juego por ID con ETag por versión del documento
+async def get_game_conditional(if_none_match: str, game_id: str):
+    game = await get_game_by_id(game_id)
+    etag = make_etag(game["id"], game.get("version", 0))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return model_response(game, Game, headers=cache_headers(etag))
+
+PRICE_DROP_PROJECTION = {"title": 1, "price": 1, "status": 1, "active": 1}
+
+# Aviso a los wishlists: el precio baja o el juego pasa a "oferta" (solo juegos que siguen activos)
+def _is_price_drop(before: dict, changes: dict) -> bool:
+    if not changes.get("active", before.get("active", True)):
+        return False
+    old_price, new_price = before.get("price"), changes.get("price")
+    if new_price is not None and old_price is not None and new_price < old_price:
+        return True
+    return changes.get("status") == "oferta" and before.get("status") != "oferta"
 
 # Actualizar juego con validación de ObjectId
 async def update_game(game_id: str, game_data: dict):
     if not ObjectId.is_valid(game_id):
         raise HTTPException(status_code=400, detail="ID inválido")
-    result = games_collection.update_one(
-        {"_id": ObjectId(game_id)},
-        {"$set": game_data}
-    )
-    if result.matched_count == 0:
+    game_data = {k: v for k, v in game_data.items() if k != "developer_name"}
+    if "title" in game_data:
+        game_data["search_terms"] = search_terms(game_data["title"])
+    if "developer_id" in game_data:
+        if not ObjectId.is_valid(game_data["developer_id"] or ""):
+            raise HTTPException(status_code=400, detail=f"ID inválido: {game_data['developer_id']}")
+        developer = await find_developer(game_data["developer_id"])
+        game_data["developer_id"] = ObjectId(game_data["developer_id"])
+        game_data["developer_name"] = developer.get("name") if developer else None
+    try:
+        # Se recupera el estado anterior para detectar bajadas de precio sin otra lectura
+        before = await games_repo.find_one_and_update(
+            {"_id": ObjectId(game_id)}, {"$set": game_data}, PRICE_DROP_PROJECTION, raw=True
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Ya existe un juego con este título")
+    games_cache.invalidate(game_id)
+    if before is None:
         raise HTTPException(status_code=404, detail="Juego no encontrado")
+    if {"title", "active", "popularity"} & game_data.keys():
+        await refresh_suggestion(game_id)
+    if "title" in game_data and game_data["title"] != before.get("title"):
+        schedule_propagation("games", "title", game_id)
+    if _is_price_drop(before, game_data):
+        await enqueue_price_drop(
+            game_id, game_data.get("title", before.get("title")), before.get("price"),
+            game_data.get("price", before.get("price")), game_data.get("status", before.get("status"))
+        )
     return {"message": "Juego actualizado correctamente"}
 
 # Desactivar juego con validación de ObjectId
 async def disable_game(game_id: str):
     if not ObjectId.is_valid(game_id):
         raise HTTPException(status_code=400, detail="ID inválido")
-    result = games_collection.update_one(
-        {"_id": ObjectId(game_id)},
-        {"$set": {"active": False}}
-    )
+    result = await games_repo.update_by_id(game_id, {"active": False})
+    games_cache.invalidate(game_id)
+    game_suggestions.remove(game_id)
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Juego no encontrado")
     return {"message": "Juego desactivado"}
+
+# Exportar el catálogo activo en streaming (NDJSON o CSV)
+async def export_games(fmt: str = "ndjson", batch_size: int = 500):
+    return export_response(games_repo, {"active": True}, GAME_EXPORT_FIELDS, fmt, batch_size, "games")
+
+# Búsqueda por texto con ranking; con prefix=True la última palabra se busca como prefijo
+async def search_games(q: str, limit: int = 10, cursor: str = None, prefix: bool = False):
+    words = WORD.findall(fold(q))
+    if not words:
+        raise HTTPException(status_code=400, detail="La búsqueda no puede estar vacía")
+    partial = words.pop() if prefix else None
+
+    after_id, after_score = None, None
+    if cursor:
+        after_id, values = decode_cursor_values(cursor)
+        after_score = values.get("score")
+
+    pipeline = search_games_pipeline(" ".join(words), partial, limit, after_id, after_score)
+    games = await games_repo.aggregate(pipeline, batch_size=limit + 1)
+
+    next_cursor = None
+    if len(games) > limit:
+        games = games[:limit]
+        last = games[-1]
+        next_cursor = encode_cursor(last["id"], score=last.get("score"))
+    return {
+        "games": games,
+        "limit": limit,
+        "next_cursor": next_cursor
+    }
+
+# Autocompletado de títulos desde el índice en memoria (sin consultar MongoDB)
+async def suggest_games(prefix: str, limit: int = 10):
+    return {"prefix": prefix, "suggestions": game_suggestions.suggest(prefix, limit)}
+
+async def _load_price_boundaries():
+    groups = await games_repo.aggregate(price_boundaries_pipeline(), raw=True)
+    boundaries = sorted({g["_id"]["min"] for g in groups if g["_id"]["min"] is not None})
+    if len(groups) < 2 or len(boundaries) < 2:
+        return DEFAULT_PRICE_BOUNDARIES
+    # El último límite de $bucket es exclusivo: se sube un céntimo para incluir el precio máximo
+    return boundaries + [round(groups[-1]["_id"]["max"] + 0.01, 2)]
+
+async def get_price_boundaries():
+    return await price_buckets_cache.get("price", _load_price_boundaries)
+
+# Los valores de la faceta de desarrollador son ObjectId
+def _facet(values: list) -> list:
+    return [
+        {"value": str(v["_id"]) if isinstance(v["_id"], ObjectId) else v["_id"], "count": v["count"]}
+        for v in values
+    ]
+
+def _price_facet(values: list, boundaries: list) -> list:
+    upper = dict(zip(boundaries, boundaries[1:]))
+    return [
+        {"min": None if v["_id"] == "otros" else v["_id"], "max": upper.get(v["_id"]), "count": v["count"]}
+        for v in values
+    ]
+
+# Navegación por facetas: conteos y página de juegos en un solo round-trip
+async def browse_games(status: str = None, developer_id: str = None, min_price: float = None,
+                       max_price: float = None, year: int = None, skip: int = 0, limit: int = 20):
+    match = {"active": True}
+    if status:
+        match["status"] = status
+    if developer_id:
+        developer_oid = to_object_id(developer_id)
+        if developer_oid is None:
+            raise HTTPException(status_code=400, detail="ID inválido")
+        match["developer_id"] = developer_oid
+    if min_price is not None or max_price is not None:
+        match["price"] = {}
+        if min_price is not None:
+            match["price"]["$gte"] = min_price
+        if max_price is not None:
+            match["price"]["$lte"] = max_price
+    if year is not None:
+        match["release_date"] = {"$gte": datetime(year, 1, 1), "$lt": datetime(year + 1, 1, 1)}
+
+    boundaries = await get_price_boundaries()
+    result = await games_repo.aggregate(browse_games_pipeline(match, boundaries, skip, limit), raw=True)
+    facets = result[0] if result else {}
+    total = facets.get("total") or [{"count": 0}]
+    return {
+        "games": [to_api(game) for game in facets.get("games", [])],
+        "facets": {
+            "status": _facet(facets.get("status", [])),
+            "price": _price_facet(facets.get("price", []), boundaries),
+            "release_year": _facet(facets.get("release_year", [])),
+            "developer": _facet(facets.get("developer", []))
+        },
+        "total": total[0]["count"],
+        "skip": skip,
+        "limit": limit
+    }
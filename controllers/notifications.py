@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, PyMongoError
+from utils.repository import MongoRepository, to_object_id
+
+logger = logging.getLogger(__name__)
+
+FANOUT_ENABLED = os.getenv("FANOUT_ENABLED", "true").lower() == "true"
+FANOUT_BATCH_SIZE = int(os.getenv("FANOUT_BATCH_SIZE", "1000"))
+# Pausa entre lotes: deja sitio al tráfico de la API mientras dura un envío grande
+FANOUT_BATCH_PAUSE = float(os.getenv("FANOUT_BATCH_PAUSE_MS", "50")) / 1000
+FANOUT_LEASE = timedelta(seconds=int(os.getenv("FANOUT_LEASE_SECONDS", "60")))
+FANOUT_POLL_SECONDS = float(os.getenv("FANOUT_POLL_SECONDS", "30"))
+FANOUT_RETRY_SECONDS = float(os.getenv("FANOUT_RETRY_SECONDS", "5"))
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+DUPLICATE_KEY_CODE = 11000
+
+# Los trabajos quedan en Mongo con su checkpoint: si el proceso cae, otro worker los retoma
+jobs_repo = MongoRepository("notification_jobs")
+notifications_repo = MongoRepository("notifications")
+wishlist_repo = MongoRepository("wishlist")
+
+_wakeup = asyncio.Event()
+
+def _now():
+    return datetime.now(timezone.utc)
+
+# Encolar el aviso de bajada de precio / oferta; update_game no espera al envío
+async def enqueue_price_drop(game_id: str, title: str, old_price: float, new_price: float, status: str):
+    game_oid = to_object_id(game_id)
+    # Si ya había un aviso pendiente para este juego, el nuevo lo sustituye
+    await jobs_repo.collection.update_many(
+        {"game_id": game_oid, "state": "pending"}, {"$set": {"state": "superseded"}}
+    )
+    job_id = await jobs_repo.insert_one({
+        "type": "price_drop",
+        "game_id": game_oid,
+        "title": title,
+        "old_price": old_price,
+        "new_price": new_price,
+        "game_status": status,
+        "state": "pending",
+        "lease_until": None,
+        "last_id": None,
+        "processed": 0,
+        "created_at": _now()
+    })
+    _wakeup.set()
+    return job_id
+
+# Tomar el trabajo más antiguo pendiente (o con el lease vencido) de forma atómica
+async def _claim_job():
+    now = _now()
+    return await jobs_repo.collection.find_one_and_update(
+        {
+            "state": {"$in": ["pending", "running"]},
+            "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}]
+        },
+        {"$set": {"state": "running", "owner": WORKER_ID, "lease_until": now + FANOUT_LEASE}},
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+def _notification(job: dict, entry: dict, created_at: datetime) -> dict:
+    return {
+        "job_id": job["_id"],
+        "user_id": entry["user_id"],
+        "game_id": job["game_id"],
+        "type": job["type"],
+        "title": job.get("title"),
+        "old_price": job.get("old_price"),
+        "new_price": job.get("new_price"),
+        "game_status": job.get("game_status"),
+        "read": False,
+        "created_at": created_at
+    }
+
+# Recorrer los wishlists del juego por lotes (índice game_id, _id) desde el último checkpoint.
+# Un lote se lee solo cuando el anterior ya se escribió: la memoria y la carga quedan acotadas
+async def _run_job(job: dict):
+    last_id = job.get("last_id")
+    while True:
+        query = {"game_id": job["game_id"]}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await wishlist_repo.find_many(
+            query, {"user_id": 1}, sort=[("_id", 1)], limit=FANOUT_BATCH_SIZE,
+            batch_size=FANOUT_BATCH_SIZE, raw=True
+        )
+        if batch:
+            created_at = _now()
+            try:
+                await notifications_repo.insert_many([_notification(job, e, created_at) for e in batch])
+            except BulkWriteError as e:
+                # Al reanudar un lote a medias, los avisos ya escritos chocan con job_user_unique
+                if any(err.get("code") != DUPLICATE_KEY_CODE for err in e.details.get("writeErrors", [])):
+                    raise
+            last_id = batch[-1]["_id"]
+
+        done = len(batch) < FANOUT_BATCH_SIZE
+        update = {"$set": {"last_id": last_id, "lease_until": None if done else _now() + FANOUT_LEASE}}
+        if done:
+            update["$set"].update({"state": "done", "finished_at": _now()})
+        if batch:
+            update["$inc"] = {"processed": len(batch)}
+        result = await jobs_repo.collection.update_one({"_id": job["_id"], "owner": WORKER_ID}, update)
+        if result.matched_count == 0:
+            logger.warning("Trabajo %s tomado por otro worker; se abandona", job["_id"])
+            return
+        if done:
+            logger.info("Aviso de precio de %s enviado", job["game_id"])
+            return
+        await asyncio.sleep(FANOUT_BATCH_PAUSE)
+
+async def _worker():
+    while True:
+        _wakeup.clear()
+        try:
+            job = await _claim_job()
+            if job is not None:
+                await _run_job(job)
+                continue
+        except PyMongoError as e:
+            # El lease vence y el trabajo se retoma desde su checkpoint
+            logger.error("Error en el envío de avisos: %s", e)
+            await asyncio.sleep(FANOUT_RETRY_SECONDS)
+            continue
+        try:
+            await asyncio.wait_for(_wakeup.wait(), FANOUT_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+def start_notification_worker():
+    if not FANOUT_ENABLED:
+        return None
+    return asyncio.create_task(_worker())
+
+async def stop_notification_worker(task):
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except (asyncio.CancelledError, PyMongoError):
+        pass
@@ -0,0 +1,139 @@
+from datetime import datetime, timezone
+from fastapi import HTTPException
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from models.purchases import Purchase
+from pipelines.purchases_pipelines import user_purchases_pipeline
+from controllers.games import games_repo
+from utils.repository import MongoRepository, to_object_id
+from utils.pagination import paginate, decode_created_cursor, created_page
+from utils.mongodb import run_transaction
+from utils.prefix_index import game_suggestions
+from controllers.rewards import points_for, record_points
+
+purchases_repo = MongoRepository("purchases")
+
+# La regla la garantiza el índice único parcial user_game_active (utils/indexes.py)
+ALREADY_PURCHASED = "El usuario ya compró este juego"
+
+# Checkout: precio copiado del juego, compra y puntos en una sola transacción
+async def create_purchase(purchase: Purchase, user_id: str):
+    if not ObjectId.is_valid(purchase.game_id) or not ObjectId.is_valid(user_id or ""):
+        raise HTTPException(status_code=400, detail="ID inválido")
+    game_oid = ObjectId(purchase.game_id)
+
+    async def checkout(session):
+        # Lectura dentro de la transacción: precio y compra salen de la misma instantánea
+        # sin escribir en el documento del juego (las compras de un mismo juego no chocan)
+        game = await games_repo.collection.find_one(
+            {"_id": game_oid, "active": True},
+            {"title": 1, "price": 1, "developer_id": 1},
+            session=session
+        )
+        if game is None:
+            raise HTTPException(status_code=404, detail="Juego no encontrado o inactivo")
+        document = {
+            "user_id": ObjectId(user_id),
+            "game_id": game["_id"],
+            "game_title": game.get("title"),
+            "developer_id": game.get("developer_id"),
+            "price": game.get("price"),
+            "points": points_for(game.get("price")),
+            "created_at": datetime.now(timezone.utc),
+            "active": True
+        }
+        purchase_id = await purchases_repo.insert_one(document, session=session)
+        if document["points"]:
+            await record_points(session, document["user_id"], document["points"], "purchase", ObjectId(purchase_id))
+        return purchase_id, document
+
+    try:
+        purchase_id, document = await run_transaction(checkout)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail=ALREADY_PURCHASED)
+
+    await _bump_popularity(game_oid)
+    return Purchase(**purchases_repo.map({**document, "_id": ObjectId(purchase_id)}))
+
+# Popularidad fuera de la transacción: un $inc atómico de un solo documento. No pasa por la
+# versión del juego porque no forma parte del modelo Game (no cambia ni sus ETags ni la caché)
+async def _bump_popularity(game_oid: ObjectId):
+    game = await games_repo.collection.find_one_and_update(
+        {"_id": game_oid},
+        {"$inc": {"popularity": 1}},
+        projection={"popularity": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if game is not None:
+        game_suggestions.set_popularity(str(game_oid), game.get("popularity", 0))
+
+# Historial de un usuario por cursor (created_at, _id); sin user_id, listado general por _id (admin)
+async def list_purchases(skip: int = 0, limit: int = 10, user_id: str = None, cursor: str = None):
+    if user_id is None:
+        purchases, _, next_cursor = await paginate(purchases_repo, {"active": True}, skip, limit, cursor, "none")
+        return {"purchases": purchases, "limit": limit, "next_cursor": next_cursor}
+
+    user_oid = to_object_id(user_id)
+    if user_oid is None:
+        raise HTTPException(status_code=400, detail="ID inválido")
+
+    after_id, after_created_at = decode_created_cursor(cursor) if cursor else (None, None)
+    pipeline = user_purchases_pipeline(user_oid, limit, after_created_at, after_id)
+    purchases, next_cursor = created_page(await purchases_repo.aggregate(pipeline, batch_size=limit + 1), limit)
+    return {"purchases": purchases, "limit": limit, "next_cursor": next_cursor}
+
+# Obtener compra por ID; con user_id solo si pertenece a ese usuario
+async def get_purchase_by_id(purchase_id: str, user_id: str = None):
+    if not ObjectId.is_valid(purchase_id):
+        raise HTTPException(status_code=400, detail="ID inválido")
+    extra = {"user_id": to_object_id(user_id)} if user_id is not None else None
+    doc = await purchases_repo.find_by_id(purchase_id, extra)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Compra no encontrada")
+    return Purchase(**doc)
+
+# Solo se corrigen datos de presentación: precio, puntos, usuario, juego y fechas forman parte
+# del checkout y del libro de puntos. La desactivación se hace con disable_purchase
+PURCHASE_EDITABLE_FIELDS = {"game_title"}
+
+async def update_purchase(purchase_id: str, purchase_data: dict):
+    if not ObjectId.is_valid(purchase_id):
+        raise HTTPException(status_code=400, detail="ID inválido")
+    purchase_data = dict(purchase_data)
+    if "active" in purchase_data:
+        if purchase_data.pop("active") is not False:
+            raise HTTPException(status_code=400, detail="Una compra desactivada no se puede reactivar")
+        if purchase_data:
+            raise HTTPException(status_code=400, detail="La desactivación no admite otros cambios")
+        return await disable_purchase(purchase_id)
+    rejected = sorted(purchase_data.keys() - PURCHASE_EDITABLE_FIELDS)
+    if rejected:
+        raise HTTPException(status_code=400, detail=f"Campos no editables: {', '.join(rejected)}")
+    if not purchase_data:
+        raise HTTPException(status_code=400, detail="No hay campos para actualizar")
+    result = await purchases_repo.update_by_id(purchase_id, purchase_data)
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Compra no encontrada")
+    return {"message": "Compra actualizada correctamente"}
+
+# Desactivar (reembolsar) una compra; el historial la conserva y los puntos se descuentan
+async def disable_purchase(purchase_id: str):
+    if not ObjectId.is_valid(purchase_id):
+        raise HTTPException(status_code=400, detail="ID inválido")
+
+    async def refund(session):
+        # Solo la primera desactivación descuenta puntos
+        purchase = await purchases_repo.collection.find_one_and_update(
+            {"_id": ObjectId(purchase_id), "active": True},
+            {"$set": {"active": False, "refunded_at": datetime.now(timezone.utc)}},
+            projection={"user_id": 1, "points": 1},
+            session=session
+        )
+        if purchase is not None and purchase.get("points"):
+            await record_points(session, purchase["user_id"], -purchase["points"], "refund", purchase["_id"])
+        return purchase
+
+    if await run_transaction(refund) is None and not await purchases_repo.find_by_id(purchase_id, projection={"_id": 1}):
+        raise HTTPException(status_code=404, detail="Compra no encontrada")
+    return {"message": "Compra desactivada"}
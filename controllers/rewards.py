@@ -0,0 +1,116 @@
+import logging
+import math
+import os
+from datetime import datetime, timezone
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from pymongo.read_concern import ReadConcern
+from pipelines.rewards_pipelines import (
+    ledger_users_pipeline, ledger_totals_pipeline, user_ledger_pipeline
+)
+from utils.repository import MongoRepository, to_object_id
+from utils.pagination import decode_created_cursor, created_page
+from utils.mongodb import run_transaction
+
+logger = logging.getLogger(__name__)
+
+# Puntos por unidad de moneda pagada (se redondea hacia abajo)
+POINTS_PER_UNIT = float(os.getenv("REWARDS_POINTS_PER_UNIT", "1"))
+RECONCILE_BATCH_SIZE = int(os.getenv("REWARDS_RECONCILE_BATCH_SIZE", "500"))
+
+# El libro es de solo inserción; el saldo es un documento por usuario (_id = user_id)
+ledger_repo = MongoRepository("reward_ledger")
+balances_repo = MongoRepository("reward_balances")
+
+def points_for(price) -> int:
+    return math.floor((price or 0) * POINTS_PER_UNIT + 1e-9)
+
+# Movimiento + saldo en la transacción del llamador (checkout, reembolso o ajuste).
+# El índice purchase_reason_unique impide aplicar dos veces el mismo movimiento de una compra
+async def record_points(session, user_oid, points: int, reason: str, purchase_oid=None, note: str = None):
+    now = datetime.now(timezone.utc)
+    entry = {"user_id": user_oid, "points": points, "reason": reason, "created_at": now}
+    if purchase_oid is not None:
+        entry["purchase_id"] = purchase_oid
+    if note:
+        entry["note"] = note
+    await ledger_repo.insert_one(entry, session=session)
+    await balances_repo.collection.update_one(
+        {"_id": user_oid},
+        {"$inc": {"points": points}, "$set": {"updated_at": now}},
+        upsert=True,
+        session=session
+    )
+
+# Saldo en O(1): una lectura por _id, sin recorrer el historial
+async def get_balance(user_id: str):
+    user_oid = to_object_id(user_id)
+    if user_oid is None:
+        raise HTTPException(status_code=400, detail="ID inválido")
+    doc = await balances_repo.find_one({"_id": user_oid}, raw=True)
+    return {
+        "user_id": user_id,
+        "points": doc["points"] if doc else 0,
+        "updated_at": doc.get("updated_at") if doc else None
+    }
+
+# Movimientos del usuario, de lo más reciente a lo más antiguo, con cursor (created_at, _id)
+async def list_ledger(user_id: str, limit: int = 10, cursor: str = None):
+    user_oid = to_object_id(user_id)
+    if user_oid is None:
+        raise HTTPException(status_code=400, detail="ID inválido")
+    after_id, after_created_at = decode_created_cursor(cursor) if cursor else (None, None)
+    pipeline = user_ledger_pipeline(user_oid, limit, after_created_at, after_id)
+    entries, next_cursor = created_page(await ledger_repo.aggregate(pipeline, batch_size=limit + 1), limit)
+    return {"entries": entries, "limit": limit, "next_cursor": next_cursor}
+
+# Ajuste manual (admin): también pasa por el libro
+async def adjust_points(user_id: str, points: int, note: str):
+    user_oid = to_object_id(user_id)
+    if user_oid is None:
+        raise HTTPException(status_code=400, detail="ID inválido")
+    if points == 0:
+        raise HTTPException(status_code=400, detail="El ajuste no puede ser de 0 puntos")
+
+    async def adjust(session):
+        await record_points(session, user_oid, points, "adjustment", note=note)
+
+    await run_transaction(adjust)
+    return await get_balance(user_id)
+
+# Reconstruir los saldos desde el libro, por lotes de usuarios. Cada lote lee sumas y saldos
+# en la misma instantánea y solo corrige los que difieren; si un checkout toca el mismo saldo
+# a la vez, la transacción choca y se reintenta con los valores nuevos
+async def reconcile_balances(batch_size: int = RECONCILE_BATCH_SIZE, dry_run: bool = False) -> dict:
+    report = {"users": 0, "fixed": 0, "dry_run": dry_run}
+    last_user = None
+    while True:
+        batch = await ledger_repo.aggregate(ledger_users_pipeline(last_user, batch_size), raw=True)
+        if not batch:
+            break
+        user_oids = [doc["_id"] for doc in batch]
+
+        async def fix(session):
+            totals = {
+                doc["_id"]: doc["points"]
+                async for doc in ledger_repo.collection.aggregate(ledger_totals_pipeline(user_oids), session=session)
+            }
+            balances = {
+                doc["_id"]: doc.get("points", 0)
+                async for doc in balances_repo.collection.find({"_id": {"$in": user_oids}}, {"points": 1}, session=session)
+            }
+            drift = {oid: total for oid, total in totals.items() if balances.get(oid) != total}
+            if drift and not dry_run:
+                await balances_repo.collection.bulk_write([
+                    UpdateOne({"_id": oid}, {"$set": {"points": total}}, upsert=True)
+                    for oid, total in drift.items()
+                ], ordered=False, session=session)
+            return drift
+
+        drift = await run_transaction(fix, read_concern=ReadConcern("snapshot"))
+        for oid, total in drift.items():
+            logger.warning(f"Saldo de {oid} distinto del libro (debería ser {total} puntos)")
+        report["users"] += len(user_oids)
+        report["fixed"] += len(drift)
+        last_user = user_oids[-1]
+    return report
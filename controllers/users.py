@@ -1,17 +1,24 @@
 import os
+import hashlib
 import logging
+import secrets
+import uuid
 import firebase_admin
-import requests
 from fastapi import HTTPException
 from firebase_admin import credentials, auth as firebase_auth
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
 from fastapi import status
 
 from models.users import User
 from models.login import Login
 
 from utils.security import create_jwt_token
-from utils.mongodb import get_collection
+from utils.repository import MongoRepository
+from utils.http import firebase_post
+from utils.executor import run_blocking
+from utils.export import export_response
+from utils.pagination import paginate
 
 # Configuración de logs
 logging.basicConfig(level=logging.INFO)
@@ -19,16 +26,24 @@ logger = logging.getLogger(__name__)
 
 # Inicializar Firebase si no está ya inicializado
 if not firebase_admin._apps:
-    print("Ruta absoluta actual:", os.getcwd())
-    print("Archivos en 'secrets/':", os.listdir("secrets"))
     ruta_absoluta = os.path.join(os.getcwd(), "secrets", "tienda_secret.json")
+    logger.debug("Credenciales de Firebase: %s", ruta_absoluta)
     cred = credentials.Certificate(ruta_absoluta)
     firebase_admin.initialize_app(cred)
 
+users_repo = MongoRepository("users", exclude=("password",))
+
+USER_EXPORT_FIELDS = [field for field in User.model_fields if field != "password"]
+
+# import_users admite como máximo 1000 usuarios por llamada
+IMPORT_BATCH_SIZE = 1000
+IMPORT_HASH_ROUNDS = int(os.getenv("IMPORT_HASH_ROUNDS", "10000"))
+
 # Crear usuario nuevo
 async def create_user(user: User) -> User:
     try:
-        user_record = firebase_auth.create_user(
+        user_record = await run_blocking(
+            firebase_auth.create_user,
             email=user.email,
             password=user.password
         )
@@ -40,27 +55,124 @@ async def create_user(user: User) -> User:
         )
 
     try:
-        coll = get_collection("users")
-
-        new_user = User(
-            name=user.name,
-            lastname=user.lastname,
-            email=user.email,
-            password=user.password
-        )
+        new_user = user.for_registration()
 
         user_dict = new_user.model_dump(exclude={"id", "password"})
-        inserted = coll.insert_one(user_dict)
-        new_user.id = str(inserted.inserted_id)
+        new_user.id = await users_repo.insert_one(user_dict)
         new_user.password = "*********"  # Enmascarar
 
         return new_user
 
     except Exception as e:
-        firebase_auth.delete_user(user_record.uid)
+        await run_blocking(firebase_auth.delete_user, user_record.uid)
         logger.error(f"Error creando usuario: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error en base de datos: {str(e)}")
 
+# Hash PBKDF2-SHA256 para import_users (Firebase no acepta contraseñas en claro al importar)
+def _hash_password(password: str):
+    salt = secrets.token_bytes(16)
+    password_hash = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, IMPORT_HASH_ROUNDS)
+    return password_hash, salt
+
+def _build_import_records(users: list) -> list:
+    records = []
+    for user in users:
+        password_hash, salt = _hash_password(user.password)
+        records.append(firebase_auth.ImportUserRecord(
+            uid=uuid.uuid4().hex,
+            email=user.email,
+            display_name=user.name_profile,
+            password_hash=password_hash,
+            password_salt=salt,
+            disabled=not user.active
+        ))
+    return records
+
+# Importar un lote (<= 1000) en Firebase y Mongo; si Mongo falla se eliminan de Firebase esos usuarios
+async def _import_batch(users: list) -> list:
+    records = await run_blocking(_build_import_records, users)
+    try:
+        import_result = await run_blocking(
+            firebase_auth.import_users,
+            records,
+            hash_alg=firebase_auth.UserImportHash.pbkdf2_sha256(rounds=IMPORT_HASH_ROUNDS)
+        )
+    except Exception as e:
+        logger.warning(e)
+        return [{"email": u.email, "status": "error", "detail": "Error al registrar usuario en Firebase"} for u in users]
+
+    results = [None] * len(users)
+    for error in import_result.errors:
+        results[error.index] = {"email": users[error.index].email, "status": "error", "detail": error.reason}
+
+    imported = [i for i in range(len(users)) if results[i] is None]
+    docs = [users[i].model_dump(exclude={"id", "password"}) for i in imported]
+    if not docs:
+        return results
+
+    failed_positions = set()
+    try:
+        await users_repo.insert_many(docs)
+    except BulkWriteError as e:
+        failed_positions = {err["index"] for err in e.details.get("writeErrors", [])}
+        logger.error(f"Importación parcial en Mongo: {len(docs) - len(failed_positions)}/{len(docs)}")
+    except Exception as e:
+        # Fallo sin detalle por documento (red, timeout...): el lote entero se da por fallido
+        logger.error(f"Importación en Mongo fallida ({len(docs)} usuarios): {e}")
+        failed_positions = set(range(len(docs)))
+        try:
+            # Lo que sí llegara a insertarse se borra para no dejar usuarios sin cuenta en Firebase
+            await users_repo.collection.delete_many({"_id": {"$in": [doc["_id"] for doc in docs if "_id" in doc]}})
+        except Exception as cleanup_error:
+            logger.error(f"No se pudieron limpiar los usuarios del lote fallido: {cleanup_error}")
+
+    # Compensación: borrar de Firebase los usuarios que no llegaron a Mongo
+    orphan_uids = [records[imported[pos]].uid for pos in failed_positions]
+    if orphan_uids:
+        try:
+            await run_blocking(firebase_auth.delete_users, orphan_uids)
+        except Exception as e:
+            logger.error(f"No se pudieron borrar de Firebase {len(orphan_uids)} usuarios huérfanos: {e}")
+
+    for pos, i in enumerate(imported):
+        if pos in failed_positions:
+            results[i] = {"email": users[i].email, "status": "error", "detail": "Error en base de datos"}
+        else:
+            results[i] = {"email": users[i].email, "status": "created", "id": str(docs[pos]["_id"])}
+    return results
+
+# Registro masivo de usuarios (admin)
+async def bulk_create_users(users: list) -> dict:
+    results = [None] * len(users)
+
+    # Un solo $in para descartar emails ya registrados
+    emails = [u.email for u in users]
+    existing = {
+        doc["email"] async for doc in users_repo.iterate({"email": {"$in": emails}}, {"email": 1}, raw=True)
+    }
+
+    pending = []
+    seen = set()
+    for i, user in enumerate(users):
+        if user.email in existing or user.email in seen:
+            results[i] = {"email": user.email, "status": "error", "detail": "Email ya registrado"}
+        else:
+            seen.add(user.email)
+            pending.append(i)
+
+    for start in range(0, len(pending), IMPORT_BATCH_SIZE):
+        positions = pending[start:start + IMPORT_BATCH_SIZE]
+        batch_results = await _import_batch([users[i] for i in positions])
+        for i, result in zip(positions, batch_results):
+            results[i] = result
+
+    created = sum(1 for r in results if r["status"] == "created")
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }
+
 # Login
 async def login(user: Login) -> dict:
     api_key = os.getenv("FIREBASE_API_KEY")
@@ -71,22 +183,13 @@ async def login(user: Login) -> dict:
             detail="FIREBASE_API_KEY no está definida en las variables de entorno"
         )
 
-    url = f"https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword?key={api_key}"
     payload = {
         "email": user.email,
         "password": user.password,
         "returnSecureToken": True
     }
 
-    response = requests.post(url, json=payload)
-
-    try:
-        response_data = response.json()
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error inesperado al procesar respuesta de Firebase: {e}"
-        )
+    response_data = await firebase_post("/v1/accounts:signInWithPassword", payload, api_key)
 
     if "error" in response_data:
         raise HTTPException(
@@ -94,8 +197,7 @@ async def login(user: Login) -> dict:
             detail="Error al autenticar usuario"
         )
 
-    coll = get_collection("users")
-    user_info = coll.find_one({"email": user.email})
+    user_info = await users_repo.find_one({"email": user.email})
 
     if not user_info:
         raise HTTPException(
@@ -106,68 +208,60 @@ async def login(user: Login) -> dict:
     return {
         "message": "Usuario autenticado correctamente",
         "idToken": create_jwt_token(
-            user_info["name"],
-            user_info["lastname"],
+            user_info["name_profile"],
             user_info["email"],
             user_info["active"],
             user_info["admin"],
-            str(user_info["_id"])
+            user_info["id"]
         )
     }
 
-# Listar todos los usuarios
-async def list_users():
-    coll = get_collection("users")
-    users_cursor = coll.find()
-    users = []
-    for doc in users_cursor:
-        doc["id"] = str(doc["_id"])
-        doc.pop("_id", None)
-        doc.pop("password", None)
-        users.append(doc)
-    return users
+# Listar usuarios con paginación por cursor (sin cargar la colección entera)
+async def list_users(skip: int = 0, limit: int = 10, cursor: str = None, total_mode: str = "exact"):
+    users, total, next_cursor = await paginate(users_repo, {}, skip, limit, cursor, total_mode)
+    return {
+        "users": users,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor
+    }
 
 # Obtener un usuario por ID
 async def get_user_by_id(user_id: str):
-    coll = get_collection("users")
     if not ObjectId.is_valid(user_id):
         raise HTTPException(status_code=400, detail="ID inválido")
     
-    doc = coll.find_one({"_id": ObjectId(user_id)})
+    doc = await users_repo.find_by_id(user_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     
-    doc["id"] = str(doc["_id"])
-    doc.pop("_id", None)
-    doc.pop("password", None)
     return doc
 
 # Actualizar usuario
 async def update_user(user_id: str, user: User):
-    coll = get_collection("users")
     if not ObjectId.is_valid(user_id):
         raise HTTPException(status_code=400, detail="ID inválido")
 
     update_data = user.model_dump(exclude_unset=True, exclude={"id", "password"})
-    result = coll.update_one({"_id": ObjectId(user_id)}, {"$set": update_data})
+    result = await users_repo.update_by_id(user_id, update_data)
 
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
-    updated_doc = coll.find_one({"_id": ObjectId(user_id)})
-    updated_doc["id"] = str(updated_doc["_id"])
-    updated_doc.pop("_id", None)
-    updated_doc.pop("password", None)
-    return updated_doc
+    return await users_repo.find_by_id(user_id)
 
 # Desactivar usuario (soft delete)
 async def deactivate_user(user_id: str) -> dict:
-    coll = get_collection("users")
     if not ObjectId.is_valid(user_id):
         raise HTTPException(status_code=400, detail="ID inválido")
 
-    result = coll.update_one({"_id": ObjectId(user_id)}, {"$set": {"active": False}})
+    result = await users_repo.update_by_id(user_id, {"active": False})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     
     return {"message": "Usuario desactivado correctamente"}
+
+# Exportar usuarios en streaming (NDJSON o CSV) sin cargarlos en memoria
+async def export_users(fmt: str = "ndjson", batch_size: int = 500):
+    return export_response(users_repo, {}, USER_EXPORT_FIELDS, fmt, batch_size, "users")
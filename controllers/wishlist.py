@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+from pipelines.wishlist_pipeline import user_wishlist_pipeline
+from controllers.games import find_game
+from utils.repository import MongoRepository, to_object_id
+from utils.pagination import decode_created_cursor, created_page
+
+wishlist_repo = MongoRepository("wishlist")
+
+# Solo se devuelve el game_id: la consulta se resuelve desde el índice user_game_unique
+WISHLISTED_PROJECTION = {"_id": 0, "game_id": 1}
+
+def _ids(user_id: str, game_id: str):
+    user_oid, game_oid = to_object_id(user_id), to_object_id(game_id)
+    if user_oid is None or game_oid is None:
+        raise HTTPException(status_code=400, detail="ID inválido")
+    return user_oid, game_oid
+
+# Añadir un juego a la lista de deseos; repetir la llamada no crea duplicados (índice único)
+async def add_to_wishlist(user_id: str, game_id: str):
+    user_oid, game_oid = _ids(user_id, game_id)
+    game = await find_game(game_id)
+    if not game or not game.get("active"):
+        raise HTTPException(status_code=404, detail="Juego no encontrado o inactivo")
+    try:
+        result = await wishlist_repo.update_one(
+            {"user_id": user_oid, "game_id": game_oid},
+            {"$setOnInsert": {"created_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+        changed = result.upserted_id is not None
+    except DuplicateKeyError:
+        # Dos altas simultáneas del mismo par: la otra ya lo insertó
+        changed = False
+    return {"game_id": game_id, "wishlisted": True, "changed": changed}
+
+# Quitar un juego de la lista; si no estaba, no es un error
+async def remove_from_wishlist(user_id: str, game_id: str):
+    user_oid, game_oid = _ids(user_id, game_id)
+    result = await wishlist_repo.delete_one({"user_id": user_oid, "game_id": game_oid})
+    return {"game_id": game_id, "wishlisted": False, "changed": result.deleted_count > 0}
+
+# Lista de deseos del usuario, de lo más reciente a lo más antiguo, con cursor (created_at, _id)
+async def list_wishlist(user_id: str, limit: int = 10, cursor: str = None):
+    user_oid = to_object_id(user_id)
+    if user_oid is None:
+        raise HTTPException(status_code=400, detail="ID inválido")
+    after_id, after_created_at = decode_created_cursor(cursor) if cursor else (None, None)
+    pipeline = user_wishlist_pipeline(user_oid, limit, after_created_at, after_id)
+    items, next_cursor = created_page(await wishlist_repo.aggregate(pipeline, batch_size=limit + 1), limit)
+    return {"items": items, "limit": limit, "next_cursor": next_cursor}
+
+# Cuáles de los juegos de una página del catálogo están en la lista del usuario: una sola consulta $in
+async def wishlisted_games(user_id: str, game_ids: list):
+    user_oid = to_object_id(user_id)
+    if user_oid is None:
+        raise HTTPException(status_code=400, detail="ID inválido")
+    # Los IDs mal formados no pueden estar en la lista: se ignoran en lugar de fallar toda la página
+    oids = list({oid for oid in map(to_object_id, game_ids) if oid is not None})
+    if not oids:
+        return {"wishlisted": []}
+    docs = await wishlist_repo.find_many(
+        {"user_id": user_oid, "game_id": {"$in": oids}}, WISHLISTED_PROJECTION,
+        batch_size=len(oids), raw=True
+    )
+    found = {str(doc["game_id"]) for doc in docs}
+    return {"wishlisted": [game_id for game_id in dict.fromkeys(game_ids) if game_id in found]}
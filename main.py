@@ -6,8 +6,10 @@ sys.path.append(os.path.dirname(__file__))
 
 import uvicorn
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
 from fastapi import FastAPI
 
@@ -23,6 +25,17 @@ from models.login import Login
 
 # Middleware personalizado
 from utils.security import validateuser, validateadmin
+from utils.mongodb import connect_to_mongo, close_mongo_connection
+from utils.indexes import sync_indexes, SYNC_ON_STARTUP
+from utils.http import start_http_client, close_http_client
+from utils.executor import start_executor, shutdown_executor
+from utils.cache import cache_metrics_text
+from utils.change_streams import start_change_streams, stop_change_streams
+from utils.prefix_index import suggestions_metrics_text
+from controllers.games import load_suggestions
+from controllers.notifications import start_notification_worker, stop_notification_worker
+from controllers.analytics import start_rollup_refresher, stop_rollup_refresher
+from controllers.display_fields import drain_propagations
 
 # Importar routers
 from routes.contracts_types import router as type_contracts_router
@@ -33,11 +46,38 @@ from routes.wishlist import router as wishlists_router
 from routes.purchases import router as purchases_router
 from routes.rewards import router as rewards_router
 from routes.users import router as users_router
-
-
+from routes.analytics import router as analytics_router
+
+
+
+# Ciclo de vida: abrir y cerrar los pools de conexiones (MongoDB y HTTP)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    connect_to_mongo()
+    start_http_client()
+    start_executor()
+    if SYNC_ON_STARTUP:
+        # Solo crea los que faltan; las reconstrucciones se hacen con python -m utils.indexes
+        await sync_indexes(rebuild=False)
+    suggestions = await load_suggestions()
+    logging.getLogger(__name__).info(
+        "Índice de sugerencias: %s títulos, %s claves, %.1f MB",
+        suggestions["items"], suggestions["keys"], suggestions["bytes"] / 1_048_576
+    )
+    change_streams = start_change_streams()
+    notification_worker = start_notification_worker()
+    rollup_refresher = start_rollup_refresher()
+    yield
+    await stop_rollup_refresher(rollup_refresher)
+    await stop_notification_worker(notification_worker)
+    await drain_propagations()
+    await stop_change_streams(change_streams)
+    await close_http_client()
+    shutdown_executor()
+    close_mongo_connection()
 
 # Inicializar app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Registrar routers
 app.include_router(type_contracts_router)
@@ -48,6 +88,7 @@ app.include_router(wishlists_router)
 app.include_router(purchases_router)
 app.include_router(rewards_router)
 app.include_router(users_router, tags=["Users"])
+app.include_router(analytics_router)
 
 # Logging básico
 logging.basicConfig(level=logging.INFO)
@@ -57,6 +98,10 @@ logger = logging.getLogger(__name__)
 def read_root():
     return {"version": "1.0.0", "message": "API Tienda de Videojuegos"}
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return cache_metrics_text() + suggestions_metrics_text()
+
 @app.post("/users")
 async def create_user_endpoint(user: User) -> User:
     return await create_user(user)
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import date, datetime
+
+class GameSales(BaseModel):
+    game_id: str = Field(..., description="ID del juego")
+    title: Optional[str] = Field(default=None, description="Título del juego en la última compra")
+    developer_id: Optional[str] = Field(default=None, description="ID del desarrollador")
+    units: int = Field(..., description="Unidades vendidas (descontando reembolsos)")
+    revenue: float = Field(..., description="Ingresos (descontando reembolsos)")
+
+class DeveloperSales(BaseModel):
+    developer_id: Optional[str] = Field(default=None, description="ID del desarrollador")
+    units: int
+    revenue: float
+
+class DailySales(BaseModel):
+    day: date
+    units: int
+    revenue: float
+
+class RollupState(BaseModel):
+    up_to: Optional[datetime] = Field(default=None, description="Compras incluidas hasta esta fecha")
+    refreshed_at: Optional[datetime] = Field(default=None, description="Último refresco de los rollups")
+
+class GameSalesResponse(RollupState):
+    games: List[GameSales]
+
+class DeveloperSalesResponse(RollupState):
+    developers: List[DeveloperSales]
+
+class DailySalesResponse(RollupState):
+    days: List[DailySales]
+
+__all__ = ["GameSalesResponse", "DeveloperSalesResponse", "DailySalesResponse"]
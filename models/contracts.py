@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import date
+
+class Contract(BaseModel):
+    id: Optional[str] = Field(default=None, description="MongoDB ID generado automáticamente")
+    developer_id: str = Field(..., description="ID del desarrollador (referencia a Developers)")
+    game_id: str = Field(..., description="ID del juego (referencia a Games)")
+    type_contract_id: str = Field(..., description="ID del tipo de contrato (referencia a Contract Types)")
+    start_date: date = Field(..., description="Fecha de inicio del contrato", examples=["2024-10-01"])
+    end_date: Optional[date] = Field(default=None, description="Fecha de finalización del contrato")
+    active: bool = Field(default=True, description="Estado activo/inactivo del contrato")
+    # Copias de presentación, se rellenan al guardar a partir de las referencias
+    developer_name: Optional[str] = Field(default=None, description="Nombre del desarrollador (copia)")
+    game_title: Optional[str] = Field(default=None, description="Título del juego (copia)")
+    contract_type_description: Optional[str] = Field(default=None, description="Descripción del tipo de contrato (copia)")
+
+class ContractPaginatedResponse(BaseModel):
+    contracts: List[Contract]
+    total: Optional[int] = None
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = None
+
+__all__ = ["Contract", "ContractPaginatedResponse"]
@@ -1,7 +1,7 @@
 from ast import List
 from pydantic import BaseModel, Field
 from typing import Optional
-from typing import List
+from typing import Dict, List
 from datetime import date
 
 class Game(BaseModel):
@@ -37,6 +37,11 @@ class Game(BaseModel):
         description="ID del desarrollador (referencia a Developers)"
     )
 
+    developer_name: Optional[str] = Field(
+        default=None,
+        description="Nombre del desarrollador (copia, se rellena al guardar)"
+    )
+
     status: str = Field(
         description="Estado del juego: demo, oferta, gratis, completo, etc.",
         examples=["demo", "oferta", "gratis", "completo"]
@@ -49,6 +54,37 @@ class Game(BaseModel):
 
 class GamePaginatedResponse(BaseModel):
     games: List[Game]
+    total: Optional[int] = None
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = None
+
+# Campos mínimos para las tarjetas de resultados de búsqueda
+class GameCard(BaseModel):
+    id: str
+    title: str
+    price: float
+    status: str
+    release_date: date
+    score: Optional[float] = None
+
+class GameSearchResponse(BaseModel):
+    games: List[GameCard]
+    limit: int
+    next_cursor: Optional[str] = None
+
+class GameSuggestion(BaseModel):
+    id: str
+    title: str
+    popularity: float = 0
+
+class GameSuggestResponse(BaseModel):
+    prefix: str
+    suggestions: List[GameSuggestion]
+
+class GameBrowseResponse(BaseModel):
+    games: List[GameCard]
+    facets: Dict[str, List[dict]]
     total: int
     skip: int
     limit: int
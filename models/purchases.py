@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class Purchase(BaseModel):
+    id: Optional[str] = Field(default=None, description="MongoDB ID generado automáticamente")
+    user_id: Optional[str] = Field(default=None, description="ID del usuario comprador (se toma del token)")
+    game_id: str = Field(..., description="ID del juego comprado (referencia a Games)")
+    game_title: Optional[str] = Field(default=None, description="Título del juego en el momento de la compra")
+    developer_id: Optional[str] = Field(default=None, description="Desarrollador del juego en el momento de la compra")
+    price: Optional[float] = Field(default=None, ge=0, description="Precio pagado (copia del precio del juego al comprar)")
+    points: Optional[int] = Field(default=None, description="Puntos de recompensa obtenidos con la compra")
+    created_at: Optional[datetime] = Field(default=None, description="Fecha de la compra")
+    refunded_at: Optional[datetime] = Field(default=None, description="Fecha del reembolso, si lo hubo")
+    active: bool = Field(default=True, description="Estado activo/inactivo (reembolsada) de la compra")
+
+class PurchasePaginatedResponse(BaseModel):
+    purchases: List[Purchase]
+    limit: int
+    next_cursor: Optional[str] = None
+
+__all__ = ["Purchase", "PurchasePaginatedResponse"]
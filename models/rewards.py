@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class RewardBalance(BaseModel):
+    user_id: str = Field(..., description="ID del usuario")
+    points: int = Field(default=0, description="Saldo de puntos (suma del libro de movimientos)")
+    updated_at: Optional[datetime] = Field(default=None, description="Último movimiento aplicado")
+
+class RewardEntry(BaseModel):
+    id: Optional[str] = Field(default=None, description="MongoDB ID generado automáticamente")
+    user_id: str = Field(..., description="ID del usuario")
+    points: int = Field(..., description="Puntos sumados (positivo) o restados (negativo)")
+    reason: str = Field(..., description="Origen del movimiento", examples=["purchase", "refund", "adjustment"])
+    purchase_id: Optional[str] = Field(default=None, description="Compra que originó el movimiento")
+    note: Optional[str] = Field(default=None, description="Comentario de un ajuste manual")
+    created_at: Optional[datetime] = Field(default=None, description="Fecha del movimiento")
+
+class RewardLedgerResponse(BaseModel):
+    entries: List[RewardEntry]
+    limit: int
+    next_cursor: Optional[str] = None
+
+class RewardAdjustment(BaseModel):
+    user_id: str = Field(..., description="ID del usuario")
+    points: int = Field(..., description="Puntos a sumar (o restar, si es negativo)")
+    note: str = Field(..., min_length=3, max_length=200, description="Motivo del ajuste")
+
+__all__ = ["RewardBalance", "RewardEntry", "RewardLedgerResponse", "RewardAdjustment"]
@@ -56,4 +56,8 @@ class User(BaseModel):
             raise ValueError("La contraseña debe contener al menos un carácter especial (@$!%*?&).")
         return value
 
+    # Alta pública: el rol y el estado no los elige quien se registra (como en el alta original)
+    def for_registration(self) -> "User":
+        return self.model_copy(update={"admin": False, "active": True})
+
 __all__ = ["User"]
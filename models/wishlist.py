@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from models.games import GameCard
+
+class WishlistItem(BaseModel):
+    id: Optional[str] = Field(default=None, description="MongoDB ID generado automáticamente")
+    user_id: str = Field(..., description="ID del usuario (referencia a Users)")
+    game_id: str = Field(..., description="ID del juego deseado (referencia a Games)")
+    created_at: Optional[datetime] = Field(default=None, description="Fecha en que se añadió a la lista")
+    game: Optional[GameCard] = Field(default=None, description="Datos del juego para mostrar la tarjeta")
+
+class WishlistPaginatedResponse(BaseModel):
+    items: List[WishlistItem]
+    limit: int
+    next_cursor: Optional[str] = None
+
+class WishlistChange(BaseModel):
+    game_id: str
+    wishlisted: bool
+    changed: bool = Field(description="False si la operación no cambió nada (ya estaba o ya no estaba)")
+
+class WishlistMembership(BaseModel):
+    wishlisted: List[str] = Field(description="IDs de la página que el usuario tiene en su lista de deseos")
+
+__all__ = ["WishlistItem", "WishlistPaginatedResponse", "WishlistChange", "WishlistMembership"]
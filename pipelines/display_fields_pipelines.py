@@ -0,0 +1,22 @@
+#Verificación de los campos de presentación copiados (nombre del desarrollador, título del juego,
+#descripción del tipo de contrato): valor embebido frente al valor actual en su colección de origen
+
+def display_copies_pipeline(source: str, field: str, ref: str, embedded: str,
+                            after_id=None, limit: int = 500):
+    match = {"_id": {"$gt": after_id}} if after_id is not None else {}
+    return [
+        {"$match": match},
+        {"$sort": {"_id": 1}},
+        {"$limit": limit},
+        {"$lookup": {
+            "from": source,
+            "localField": ref,
+            "foreignField": "_id",
+            "pipeline": [{"$project": {"_id": 0, "value": f"${field}"}}],
+            "as": "source"
+        }},
+        {"$project": {
+            "current": {"$ifNull": [f"${embedded}", None]},
+            "expected": {"$ifNull": [{"$arrayElemAt": ["$source.value", 0]}, None]}
+        }}
+    ]
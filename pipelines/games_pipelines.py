@@ -0,0 +1,50 @@
+#Navegación por facetas del catálogo: conteos por estado, precio, año y desarrollador
+#junto con la página de juegos en una sola agregación ($facet)
+
+from pipelines.search_pipelines import CARD_PROJECTION
+
+# Límites por defecto de los rangos de precio (si todavía no hay datos para calcularlos)
+DEFAULT_PRICE_BOUNDARIES = [0, 0.01, 10, 20, 40, 60]
+MAX_DEVELOPER_FACETS = 50
+
+# Límites de precio según la distribución real de precios activos
+def price_boundaries_pipeline(buckets: int = 5):
+    return [
+        {"$match": {"active": True}},
+        {"$bucketAuto": {"groupBy": "$price", "buckets": buckets}}
+    ]
+
+def browse_games_pipeline(match: dict, price_boundaries: list, skip: int = 0, limit: int = 20):
+    return [
+        {"$match": match},
+        {"$facet": {
+            "status": [
+                {"$sortByCount": "$status"}
+            ],
+            "price": [
+                {"$bucket": {
+                    "groupBy": "$price",
+                    "boundaries": price_boundaries,
+                    "default": "otros",
+                    "output": {"count": {"$sum": 1}}
+                }}
+            ],
+            "release_year": [
+                {"$group": {"_id": {"$year": "$release_date"}, "count": {"$sum": 1}}},
+                {"$sort": {"_id": -1}}
+            ],
+            "developer": [
+                {"$sortByCount": "$developer_id"},
+                {"$limit": MAX_DEVELOPER_FACETS}
+            ],
+            "games": [
+                {"$sort": {"_id": 1}},
+                {"$skip": skip},
+                {"$limit": limit},
+                {"$project": CARD_PROJECTION}
+            ],
+            "total": [
+                {"$count": "count"}
+            ]
+        }}
+    ]
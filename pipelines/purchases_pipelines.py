@@ -0,0 +1,90 @@
+#Historial de compras por usuario: índice (user_id, created_at, _id) y paginación por cursor
+
+# Página del historial de un usuario, de la más reciente a la más antigua;
+# el cursor es (created_at, _id) de la última compra devuelta
+def user_purchases_pipeline(user_id, limit: int = 10, after_created_at=None, after_id=None):
+    match = {"user_id": user_id}
+    if after_created_at is not None and after_id is not None:
+        match["$or"] = [
+            {"created_at": {"$lt": after_created_at}},
+            {"created_at": after_created_at, "_id": {"$lt": after_id}}
+        ]
+    return [
+        {"$match": match},
+        {"$sort": {"created_at": -1, "_id": -1}},
+        {"$limit": limit + 1}
+    ]
+
+#Rollups de ventas (vistas materializadas con $merge), refrescados por ventanas (start, end] de created_at
+
+SALES_BY_GAME = "sales_by_game"
+SALES_BY_DEVELOPER = "sales_by_developer"
+SALES_DAILY = "sales_daily"
+ROLLUP_TOTALS = ("units", "revenue")
+
+# Movimientos de la ventana: compras creadas (+1, +precio) y reembolsos (-1, -precio).
+# El reembolso se imputa al día de la compra, así sales_daily refleja las ventas netas de cada día
+def _sales_window(start, end):
+    fields = {"game_id": 1, "developer_id": 1, "game_title": 1, "created_at": 1}
+    return [
+        # Compras reembolsadas antes de existir refunded_at no cuentan
+        {"$match": {
+            "created_at": {"$gt": start, "$lte": end},
+            "$or": [{"active": True}, {"refunded_at": {"$exists": True}}]
+        }},
+        {"$project": {**fields, "units": {"$literal": 1}, "revenue": "$price"}},
+        {"$unionWith": {"coll": "purchases", "pipeline": [
+            {"$match": {"refunded_at": {"$gt": start, "$lte": end}}},
+            {"$project": {**fields, "units": {"$literal": -1}, "revenue": {"$multiply": ["$price", -1]}}}
+        ]}}
+    ]
+
+# Suma los totales de la ventana al documento existente. Cada refresco lleva su id (fin de la ventana):
+# si un refresco interrumpido se repite, los documentos que ya lo aplicaron no se vuelven a sumar
+def _merge_totals(into: str, refresh, extra: dict = None):
+    already_applied = {"$eq": ["$refresh", "$$new.refresh"]}
+    totals = {
+        field: {"$cond": [already_applied, f"${field}", {"$add": [{"$ifNull": [f"${field}", 0]}, f"$$new.{field}"]}]}
+        for field in ROLLUP_TOTALS
+    }
+    return [
+        {"$set": {"refresh": refresh}},
+        {"$merge": {
+            "into": into,
+            "on": "_id",
+            "whenMatched": [{"$set": {**totals, **(extra or {}), "refresh": "$$new.refresh"}}],
+            "whenNotMatched": "insert"
+        }}
+    ]
+
+def _group_totals(key, **fields):
+    return {"$group": {
+        "_id": key,
+        "units": {"$sum": "$units"},
+        "revenue": {"$sum": "$revenue"},
+        **fields
+    }}
+
+def sales_by_game_pipeline(start, end):
+    # $last solo es determinista con la entrada ordenada: el título más reciente de la ventana
+    return _sales_window(start, end) + [
+        {"$sort": {"created_at": 1, "_id": 1}},
+        _group_totals("$game_id", title={"$last": "$game_title"}, developer_id={"$last": "$developer_id"})
+    ] + _merge_totals(SALES_BY_GAME, end, {"title": "$$new.title", "developer_id": "$$new.developer_id"})
+
+def sales_by_developer_pipeline(start, end):
+    return _sales_window(start, end) + [
+        _group_totals("$developer_id")
+    ] + _merge_totals(SALES_BY_DEVELOPER, end)
+
+def sales_daily_pipeline(start, end):
+    return _sales_window(start, end) + [
+        _group_totals({"$dateTrunc": {"date": "$created_at", "unit": "day"}})
+    ] + _merge_totals(SALES_DAILY, end)
+
+def sales_rollup_pipelines(start, end):
+    return [
+        sales_by_game_pipeline(start, end),
+        sales_by_developer_pipeline(start, end),
+        sales_daily_pipeline(start, end)
+    ]
@@ -0,0 +1,33 @@
+#Libro de puntos: historial por usuario y sumas para reconciliar los saldos
+
+# Siguiente lote de usuarios con movimientos ($sort + $group sobre el índice user_created_at: DISTINCT_SCAN)
+def ledger_users_pipeline(after_user=None, limit: int = 500):
+    match = {"user_id": {"$gt": after_user}} if after_user is not None else {}
+    return [
+        {"$match": match},
+        {"$sort": {"user_id": 1}},
+        {"$group": {"_id": "$user_id"}},
+        {"$sort": {"_id": 1}},
+        {"$limit": limit}
+    ]
+
+# Saldo real de cada usuario del lote: suma de todos sus movimientos
+def ledger_totals_pipeline(user_ids: list):
+    return [
+        {"$match": {"user_id": {"$in": user_ids}}},
+        {"$group": {"_id": "$user_id", "points": {"$sum": "$points"}}}
+    ]
+
+# Página del historial de movimientos de un usuario, con cursor (created_at, _id)
+def user_ledger_pipeline(user_id, limit: int = 10, after_created_at=None, after_id=None):
+    match = {"user_id": user_id}
+    if after_created_at is not None and after_id is not None:
+        match["$or"] = [
+            {"created_at": {"$lt": after_created_at}},
+            {"created_at": after_created_at, "_id": {"$lt": after_id}}
+        ]
+    return [
+        {"$match": match},
+        {"$sort": {"created_at": -1, "_id": -1}},
+        {"$limit": limit + 1}
+    ]
@@ -0,0 +1,40 @@
+import re
+
+# Solo los campos de las tarjetas de resultados
+CARD_PROJECTION = {"title": 1, "price": 1, "status": 1, "release_date": 1}
+
+# Búsqueda de juegos activos: $text (ranking por textScore) y/o prefijo sobre search_terms,
+# con paginación por cursor sobre (score, _id)
+def search_games_pipeline(words: str = None, prefix: str = None, limit: int = 10,
+                          after_id=None, after_score: float = None):
+    match = {"active": True}
+    if words:
+        match["$text"] = {"$search": words}
+    if prefix:
+        match["search_terms"] = {"$regex": f"^{re.escape(prefix)}"}
+
+    if not words:
+        if after_id is not None:
+            match["_id"] = {"$gt": after_id}
+        return [
+            {"$match": match},
+            {"$sort": {"_id": 1}},
+            {"$limit": limit + 1},
+            {"$project": CARD_PROJECTION}
+        ]
+
+    pipeline = [
+        {"$match": match},
+        {"$set": {"score": {"$meta": "textScore"}}}
+    ]
+    if after_id is not None and after_score is not None:
+        pipeline.append({"$match": {"$or": [
+            {"score": {"$lt": after_score}},
+            {"score": after_score, "_id": {"$gt": after_id}}
+        ]}})
+    pipeline += [
+        {"$sort": {"score": -1, "_id": 1}},
+        {"$limit": limit + 1},
+        {"$project": {**CARD_PROJECTION, "score": 1}}
+    ]
+    return pipeline
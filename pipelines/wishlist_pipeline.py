@@ -0,0 +1,25 @@
+#Lista de deseos de un usuario con la tarjeta de cada juego, paginada por cursor (created_at, _id)
+
+from pipelines.search_pipelines import CARD_PROJECTION
+
+def user_wishlist_pipeline(user_id, limit: int = 10, after_created_at=None, after_id=None):
+    match = {"user_id": user_id}
+    if after_created_at is not None and after_id is not None:
+        match["$or"] = [
+            {"created_at": {"$lt": after_created_at}},
+            {"created_at": after_created_at, "_id": {"$lt": after_id}}
+        ]
+    return [
+        {"$match": match},
+        {"$sort": {"created_at": -1, "_id": -1}},
+        {"$limit": limit + 1},
+        # El join se hace solo sobre la página ya recortada
+        {"$lookup": {
+            "from": "games",
+            "localField": "game_id",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {**CARD_PROJECTION, "_id": 0, "id": {"$toString": "$_id"}}}],
+            "as": "game"
+        }},
+        {"$unwind": {"path": "$game", "preserveNullAndEmptyArrays": True}}
+    ]
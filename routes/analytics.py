@@ -0,0 +1,50 @@
+from datetime import date, timedelta
+from fastapi import APIRouter, Query, Request
+from typing import Optional
+from models.analytics import GameSalesResponse, DeveloperSalesResponse, DailySalesResponse
+from controllers.analytics import top_games, top_developers, daily_sales, refresh_sales_rollups
+from utils.security import validateadmin
+from utils.responses import FastJSONRoute
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"], route_class=FastJSONRoute)
+
+@router.get(
+    "/sales/games",
+    summary="Ingresos y unidades por juego (admin)",
+    response_model=GameSalesResponse
+)
+@validateadmin
+async def get_sales_by_game(request: Request, limit: int = Query(20, ge=1, le=200)):
+    return await top_games(limit)
+
+@router.get(
+    "/sales/developers",
+    summary="Ingresos y unidades por desarrollador (admin)",
+    response_model=DeveloperSalesResponse
+)
+@validateadmin
+async def get_sales_by_developer(request: Request, limit: int = Query(20, ge=1, le=200)):
+    return await top_developers(limit)
+
+@router.get(
+    "/sales/daily",
+    summary="Unidades e ingresos por día (admin)",
+    response_model=DailySalesResponse
+)
+@validateadmin
+async def get_daily_sales(
+    request: Request,
+    start: Optional[date] = Query(None, alias="from", description="Por defecto, hace 30 días"),
+    end: Optional[date] = Query(None, alias="to", description="Por defecto, hoy")
+):
+    end = end or date.today()
+    return await daily_sales(start or end - timedelta(days=30), end)
+
+@router.post(
+    "/sales/refresh",
+    summary="Aplicar a los rollups las compras nuevas (admin)",
+    response_model=dict
+)
+@validateadmin
+async def refresh_sales(request: Request):
+    return await refresh_sales_rollups()
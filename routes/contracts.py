@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Path, Body, Query, status, Request
+from typing import List, Optional
+from models.contracts import Contract, ContractPaginatedResponse
+from controllers.contracts import (
+    create_contract, create_contracts_bulk, list_contracts, list_contracts_with_details,
+    export_contracts,
+    get_contract_by_id, update_contract,
+    disable_contract
+)
+from utils.security import validateadmin, validateuser
+from utils.pagination import TotalMode
+from utils.responses import FastJSONRoute
+from utils.export import ExportFormat
+
+router = APIRouter(prefix="/contracts", tags=["Contracts"], route_class=FastJSONRoute)
+
+MAX_BULK_CONTRACTS = 1000
+
+@router.post(
+    "",
+    summary="Crear un nuevo contrato",
+    response_model=Contract,
+    status_code=status.HTTP_201_CREATED
+)
+@validateadmin
+async def add_contract(request: Request, contract: Contract):
+    return await create_contract(contract)
+
+@router.post(
+    "/bulk",
+    summary="Crear contratos en lote",
+    response_model=dict
+)
+@validateadmin
+async def add_contracts_bulk(
+    request: Request,
+    contracts: List[Contract] = Body(..., max_length=MAX_BULK_CONTRACTS)
+):
+    return await create_contracts_bulk(contracts)
+
+@router.get(
+    "",
+    summary="Listar contratos activos",
+    response_model=ContractPaginatedResponse
+)
+@validateuser
+async def get_contracts(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco devuelto como next_cursor"),
+    total_mode: TotalMode = Query("exact", description="exact, cached, estimated o none")
+):
+    return await list_contracts(skip, limit, cursor, total_mode)
+
+@router.get(
+    "/details",
+    summary="Listar contratos activos con desarrollador, juego y tipo de contrato",
+    response_model=dict
+)
+@validateuser
+async def get_contracts_details(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100)
+):
+    return await list_contracts_with_details(skip, limit)
+
+@router.get(
+    "/export",
+    summary="Exportar contratos activos (admin)"
+)
+@validateadmin
+async def export_all_contracts(
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="ndjson o csv"),
+    batch_size: int = Query(500, ge=1, le=5000)
+):
+    return await export_contracts(format, batch_size)
+
+@router.get(
+    "/{contract_id}",
+    summary="Obtener contrato por ID",
+    response_model=Contract
+)
+@validateuser
+async def get_contract(request: Request, contract_id: str = Path(..., description="ID del contrato")):
+    return await get_contract_by_id(contract_id)
+
+@router.put(
+    "/{contract_id}",
+    summary="Actualizar contrato existente"
+)
+@validateadmin
+async def edit_contract(request: Request, contract_id: str, contract_data: dict = Body(...)):
+    return await update_contract(contract_id, contract_data)
+
+@router.delete(
+    "/{contract_id}",
+    summary="Desactivar (no eliminar) un contrato"
+)
+@validateadmin
+async def remove_contract(request: Request, contract_id: str):
+    return await disable_contract(contract_id)
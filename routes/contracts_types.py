@@ -1,4 +1,5 @@
-from fastapi import APIRouter, status, Path, Body
+from fastapi import APIRouter, status, Path, Body, Query, Request
+from typing import Optional
 from models.contracts_types import ContractType
 from controllers.contracts_types import (
     create_contract_type,
@@ -7,6 +8,7 @@ from controllers.contracts_types import (
     disable_contract_type
 )
 from utils.security import validateadmin
+from utils.pagination import TotalMode
 
 router = APIRouter(prefix="/contract_types", tags=["Contract Types"])
 
@@ -17,7 +19,7 @@ router = APIRouter(prefix="/contract_types", tags=["Contract Types"])
     status_code=status.HTTP_201_CREATED
 )
 @validateadmin
-async def add_contract_type(contract_type: ContractType):
+async def add_contract_type(request: Request, contract_type: ContractType):
     return await create_contract_type(contract_type)
 
 @router.get(
@@ -26,8 +28,14 @@ async def add_contract_type(contract_type: ContractType):
     response_model=dict
 )
 @validateadmin
-async def get_contract_types(skip: int = 0, limit: int = 10):
-    return await list_contract_types(skip, limit)
+async def get_contract_types(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco devuelto como next_cursor"),
+    total_mode: TotalMode = Query("exact", description="exact, cached, estimated o none")
+):
+    return await list_contract_types(skip, limit, cursor, total_mode)
 
 @router.put(
     "/{contract_type_id}",
@@ -35,6 +43,7 @@ async def get_contract_types(skip: int = 0, limit: int = 10):
 )
 @validateadmin
 async def edit_contract_type(
+    request: Request,
     contract_type_id: str = Path(..., description="ID del tipo de contrato"),
     contract_type_data: dict = Body(...)
 ):
@@ -45,5 +54,5 @@ async def edit_contract_type(
     summary="Desactivar (no eliminar) tipo de contrato"
 )
 @validateadmin
-async def remove_contract_type(contract_type_id: str):
+async def remove_contract_type(request: Request, contract_type_id: str):
     return await disable_contract_type(contract_type_id)
\ No newline at end of file
@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Path, Body, status, Request
-from typing import List
 from models.developers import Developer, DeveloperPaginatedResponse
 
 
@@ -28,11 +27,11 @@ async def add_developer(request: Request, developer: Developer):
 @router.get(
     "",
     summary="Listar desarrolladores activos",
-    response_model=List[Developer]
+    response_model=DeveloperPaginatedResponse
 )
 @validateuser
-async def get_developers(request: Request):
-    return await list_developers()
+async def get_developers(request: Request, skip: int = 0, limit: int = 10):
+    return await list_developers(skip, limit)
 
 @router.get(
     "/{dev_id}",
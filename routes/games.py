@@ -1,25 +1,75 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Request
 from controllers.games import (
-    create_game, list_games, get_game_by_id,
-    update_game, disable_game
+    create_game, list_games_conditional, get_game_conditional,
+    update_game, disable_game, export_games, search_games, browse_games,
+    suggest_games
 )
-from models.games import Game, GamePaginatedResponse
-from typing import List
+from models.games import (
+    Game, GamePaginatedResponse, GameSearchResponse, GameBrowseResponse,
+    GameSuggestResponse
+)
+from typing import List, Optional
+from utils.pagination import TotalMode
+from utils.responses import FastJSONRoute
+from utils.export import ExportFormat
+from utils.security import validateadmin
 
-router = APIRouter(prefix="/games", tags=["Games"])
+router = APIRouter(prefix="/games", tags=["Games"], route_class=FastJSONRoute)
 
 @router.post("/", response_model=Game)
 async def create(game: Game):
     return await create_game(game)
 
 @router.get("/", response_model=GamePaginatedResponse)
-async def list_all(skip: int = 0, limit: int = 10):
-    return await list_games(skip, limit)
+async def list_all(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco devuelto como next_cursor"),
+    total_mode: TotalMode = Query("exact", description="exact, cached, estimated o none")
+):
+    return await list_games_conditional(request.headers.get("if-none-match"), skip, limit, cursor, total_mode)
+
+@router.get("/search", response_model=GameSearchResponse, summary="Buscar juegos por título y descripción")
+async def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="Cursor opaco devuelto como next_cursor"),
+    prefix: bool = Query(False, description="Tratar la última palabra como prefijo (búsqueda mientras se escribe)")
+):
+    return await search_games(q, limit, cursor, prefix)
+
+@router.get("/suggest", response_model=GameSuggestResponse, summary="Autocompletar títulos de juegos")
+async def suggest(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20)
+):
+    return await suggest_games(prefix, limit)
+
+@router.get("/browse", response_model=GameBrowseResponse, summary="Catálogo con facetas (estado, precio, año, desarrollador)")
+async def browse(
+    status: Optional[str] = Query(None, description="demo, oferta, gratis, completo"),
+    developer_id: Optional[str] = Query(None),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    year: Optional[int] = Query(None, ge=1970, le=2100),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    return await browse_games(status, developer_id, min_price, max_price, year, skip, limit)
 
+@router.get("/export", summary="Exportar catálogo (admin)")
+@validateadmin
+async def export_all(
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="ndjson o csv"),
+    batch_size: int = Query(500, ge=1, le=5000)
+):
+    return await export_games(format, batch_size)
 
 @router.get("/{game_id}", response_model=Game)
-async def get_by_id(game_id: str):
-    return await get_game_by_id(game_id)
+async def get_by_id(request: Request, game_id: str):
+    return await get_game_conditional(request.headers.get("if-none-match"), game_id)
 
 @router.put("/{game_id}")
 async def update(game_id: str, game_data: dict):
@@ -1,33 +1,45 @@
-from fastapi import APIRouter, Path, Body, status, Request
-from typing import List
-from models.purchases import Purchase
+from fastapi import APIRouter, Path, Body, Query, status, Request
+from typing import Optional
+from models.purchases import Purchase, PurchasePaginatedResponse
 from controllers.purchases import (
     create_purchase, list_purchases,
     get_purchase_by_id, update_purchase,
     disable_purchase
 )
 from utils.security import validateuser, validateadmin
+from utils.responses import FastJSONRoute
 
-router = APIRouter(prefix="/purchases", tags=["Purchases"])
+router = APIRouter(prefix="/purchases", tags=["Purchases"], route_class=FastJSONRoute)
+
+# Los administradores ven todas las compras; el resto, solo las suyas
+def _owner(request: Request) -> Optional[str]:
+    return None if getattr(request.state, "admin", False) else request.state.id
 
 @router.post(
     "",
-    summary="Crear una nueva compra",
+    summary="Comprar un juego (precio del momento, transacción)",
     response_model=Purchase,
     status_code=status.HTTP_201_CREATED
 )
 @validateuser
 async def add_purchase(request: Request, purchase: Purchase):
-    return await create_purchase(purchase)
+    return await create_purchase(purchase, request.state.id)
 
 @router.get(
     "",
-    summary="Listar todas las compras activas",
-    response_model=dict
+    summary="Historial de compras (propio, o de cualquier usuario para admin)",
+    response_model=PurchasePaginatedResponse
 )
-@validateadmin
-async def get_purchases(request: Request, skip: int = 0, limit: int = 10):
-    return await list_purchases(skip, limit)
+@validateuser
+async def get_purchases(
+    request: Request,
+    skip: int = Query(0, ge=0, description="Solo para el listado general de admin"),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco devuelto como next_cursor"),
+    user_id: Optional[str] = Query(None, description="Historial de un usuario (solo admin)")
+):
+    owner = _owner(request)
+    return await list_purchases(skip=skip, limit=limit, user_id=owner or user_id, cursor=cursor)
 
 @router.get(
     "/{purchase_id}",
@@ -36,11 +48,11 @@ async def get_purchases(request: Request, skip: int = 0, limit: int = 10):
 )
 @validateuser
 async def get_purchase(request: Request, purchase_id: str = Path(..., description="ID de la compra")):
-    return await get_purchase_by_id(purchase_id)
+    return await get_purchase_by_id(purchase_id, _owner(request))
 
 @router.put(
     "/{purchase_id}",
-    summary="Actualizar compra existente"
+    summary="Corregir el título copiado de una compra (active=false la desactiva)"
 )
 @validateadmin
 async def edit_purchase(request: Request, purchase_id: str, purchase_data: dict = Body(...)):
@@ -53,15 +65,3 @@ async def edit_purchase(request: Request, purchase_id: str, purchase_data: dict
 @validateadmin
 async def remove_purchase(request: Request, purchase_id: str):
     return await disable_purchase(purchase_id)
-
-@router.get("/")
-@validateuser
-async def get_purchases(
-    request: Request,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100)
-):
-    user_id = None
-    if not getattr(request.state, "admin", False):
-        user_id = request.state.id
-    return await list_purchases(skip=skip, limit=limit, user_id=user_id)
\ No newline at end of file
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Body, Query, Request
+from typing import Optional
+from models.rewards import RewardBalance, RewardLedgerResponse, RewardAdjustment
+from controllers.rewards import get_balance, list_ledger, adjust_points, reconcile_balances
+from utils.security import validateuser, validateadmin
+from utils.responses import FastJSONRoute
+
+router = APIRouter(prefix="/rewards", tags=["Rewards"], route_class=FastJSONRoute)
+
+# Los administradores pueden consultar a cualquier usuario; el resto, solo a sí mismo
+def _target(request: Request, user_id: Optional[str]) -> str:
+    if user_id and getattr(request.state, "admin", False):
+        return user_id
+    return request.state.id
+
+@router.get(
+    "/balance",
+    summary="Saldo de puntos",
+    response_model=RewardBalance
+)
+@validateuser
+async def get_reward_balance(
+    request: Request,
+    user_id: Optional[str] = Query(None, description="Usuario a consultar (solo admin)")
+):
+    return await get_balance(_target(request, user_id))
+
+@router.get(
+    "/ledger",
+    summary="Movimientos de puntos",
+    response_model=RewardLedgerResponse
+)
+@validateuser
+async def get_reward_ledger(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco devuelto como next_cursor"),
+    user_id: Optional[str] = Query(None, description="Usuario a consultar (solo admin)")
+):
+    return await list_ledger(_target(request, user_id), limit, cursor)
+
+@router.post(
+    "/adjustments",
+    summary="Ajuste manual de puntos (admin)",
+    response_model=RewardBalance
+)
+@validateadmin
+async def add_adjustment(request: Request, adjustment: RewardAdjustment = Body(...)):
+    return await adjust_points(adjustment.user_id, adjustment.points, adjustment.note)
+
+@router.post(
+    "/reconcile",
+    summary="Recalcular los saldos desde el libro de movimientos (admin)",
+    response_model=dict
+)
+@validateadmin
+async def reconcile(
+    request: Request,
+    dry_run: bool = Query(False, description="Solo informar de las diferencias"),
+    batch_size: int = Query(500, ge=1, le=5000)
+):
+    return await reconcile_balances(batch_size, dry_run)
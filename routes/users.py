@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Body, Query, Request
+from typing import List
+from models.users import User
+from controllers.users import bulk_create_users, export_users
+from utils.security import validateadmin
+from utils.export import ExportFormat
+
+router = APIRouter(prefix="/users")
+
+MAX_BULK_USERS = 10000
+
+@router.post(
+    "/bulk",
+    summary="Registro masivo de usuarios (admin)",
+    response_model=dict
+)
+@validateadmin
+async def add_users_bulk(
+    request: Request,
+    users: List[User] = Body(..., max_length=MAX_BULK_USERS)
+):
+    return await bulk_create_users(users)
+
+@router.get(
+    "/export",
+    summary="Exportar usuarios (admin)"
+)
+@validateadmin
+async def export_all_users(
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="ndjson o csv"),
+    batch_size: int = Query(500, ge=1, le=5000)
+):
+    return await export_users(format, batch_size)
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Path, Query, Request
+from typing import List, Optional
+from models.wishlist import WishlistPaginatedResponse, WishlistChange, WishlistMembership
+from controllers.wishlist import (
+    add_to_wishlist, remove_from_wishlist,
+    list_wishlist, wishlisted_games
+)
+from utils.security import validateuser
+from utils.responses import FastJSONRoute
+
+router = APIRouter(prefix="/wishlist", tags=["Wishlist"], route_class=FastJSONRoute)
+
+# Tamaño máximo de página de list_games
+MAX_MEMBERSHIP_IDS = 100
+
+@router.get(
+    "",
+    summary="Lista de deseos del usuario",
+    response_model=WishlistPaginatedResponse
+)
+@validateuser
+async def get_wishlist(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco devuelto como next_cursor")
+):
+    return await list_wishlist(request.state.id, limit, cursor)
+
+@router.get(
+    "/contains",
+    summary="Qué juegos de una página están en la lista de deseos (una sola consulta)",
+    response_model=WishlistMembership
+)
+@validateuser
+async def get_membership(
+    request: Request,
+    game_ids: List[str] = Query(..., max_length=MAX_MEMBERSHIP_IDS, description="IDs de la página de juegos")
+):
+    return await wishlisted_games(request.state.id, game_ids)
+
+@router.put(
+    "/{game_id}",
+    summary="Añadir un juego a la lista de deseos (idempotente)",
+    response_model=WishlistChange
+)
+@validateuser
+async def add_game(request: Request, game_id: str = Path(..., description="ID del juego")):
+    return await add_to_wishlist(request.state.id, game_id)
+
+@router.delete(
+    "/{game_id}",
+    summary="Quitar un juego de la lista de deseos (idempotente)",
+    response_model=WishlistChange
+)
+@validateuser
+async def remove_game(request: Request, game_id: str = Path(..., description="ID del juego")):
+    return await remove_from_wishlist(request.state.id, game_id)
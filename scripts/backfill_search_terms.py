@@ -0,0 +1,47 @@
+# Rellena search_terms en los juegos creados antes de la búsqueda por prefijo
+# Uso: python -m scripts.backfill_search_terms [--batch-size 1000]
+import argparse
+import asyncio
+import logging
+from pymongo import UpdateOne
+from utils.mongodb import get_collection, connect_to_mongo, close_mongo_connection
+from utils.text import search_terms
+
+logger = logging.getLogger(__name__)
+
+async def backfill(batch_size: int = 1000) -> int:
+    games = get_collection("games")
+    query = {"search_terms": {"$exists": False}}
+    updated = 0
+    last_id = None
+
+    while True:
+        page_query = dict(query)
+        if last_id is not None:
+            page_query["_id"] = {"$gt": last_id}
+        batch = await games.find(page_query, {"title": 1}).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        operations = [
+            UpdateOne({"_id": doc["_id"]}, {"$set": {"search_terms": search_terms(doc.get("title", ""))}})
+            for doc in batch
+        ]
+        result = await games.bulk_write(operations, ordered=False)
+        updated += result.modified_count
+        last_id = batch[-1]["_id"]
+        logger.info(f"search_terms rellenado en {updated} juegos")
+    return updated
+
+async def _main(batch_size: int):
+    connect_to_mongo()
+    try:
+        print({"updated": await backfill(batch_size)})
+    finally:
+        close_mongo_connection()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rellenar search_terms de los juegos existentes")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.batch_size))
@@ -0,0 +1,24 @@
+# Verifica las copias de nombres en contratos y juegos (developer_name, game_title,
+# contract_type_description) contra su colección de origen; con --repair las corrige.
+# También sirve para rellenarlas en los documentos creados antes de existir.
+# Uso: python -m scripts.check_display_fields [--batch-size 500] [--repair]
+import argparse
+import asyncio
+import logging
+from utils.mongodb import connect_to_mongo, close_mongo_connection
+from controllers.display_fields import check_display_copies
+
+async def _main(batch_size: int, repair: bool):
+    connect_to_mongo()
+    try:
+        print(await check_display_copies(repair, batch_size))
+    finally:
+        close_mongo_connection()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verificar (y corregir) los campos de presentación copiados")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--repair", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.batch_size, args.repair))
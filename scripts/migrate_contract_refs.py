@@ -0,0 +1,133 @@
+# Migración en línea: convierte las referencias guardadas como string a ObjectId
+# (contratos, juegos, compras y el rollup de ventas por juego) y une las filas de
+# sales_by_developer que quedaron con el desarrollador como string
+# Uso: python -m scripts.migrate_contract_refs [--batch-size 500] [--dry-run]
+import argparse
+import asyncio
+import logging
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from utils.mongodb import get_collection, connect_to_mongo, close_mongo_connection, run_transaction
+from pipelines.purchases_pipelines import SALES_BY_GAME, SALES_BY_DEVELOPER, ROLLUP_TOTALS
+
+logger = logging.getLogger(__name__)
+
+# Colección -> referencias que deben ser ObjectId
+REFS = {
+    "contracts": ("developer_id", "game_id", "type_contract_id"),
+    "games": ("developer_id",),
+    "purchases": ("developer_id",),
+    SALES_BY_GAME: ("developer_id",),
+}
+
+def _conversion(collection: str, doc: dict, refs: tuple):
+    changes = {}
+    for field in refs:
+        value = doc.get(field)
+        if isinstance(value, str):
+            if ObjectId.is_valid(value):
+                changes[field] = ObjectId(value)
+            else:
+                logger.warning(f"{collection} {doc['_id']}: {field} no es un ObjectId válido ({value!r})")
+    return changes
+
+# Recorre por _id ascendente en lotes; se puede interrumpir y relanzar sin perder trabajo.
+# Los documentos que no se pueden convertir (p. ej. por un índice único) quedan en "conflicts"
+# con su string original, para resolverlos a mano y relanzar.
+# La forma de la API no cambia (el id se sigue devolviendo como string): no hace falta subir
+# la versión de los juegos ni invalidar cachés
+async def migrate_collection(name: str, refs: tuple, batch_size: int = 500, dry_run: bool = False) -> dict:
+    collection = get_collection(name)
+    pending = {"$or": [{field: {"$type": "string"}} for field in refs]}
+    last_id = None
+    stats = {"scanned": 0, "converted": 0, "conflicts": []}
+
+    while True:
+        query = dict(pending)
+        if last_id is not None:
+            query = {"$and": [pending, {"_id": {"$gt": last_id}}]}
+        batch = await collection.find(query, {field: 1 for field in refs}) \
+            .sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+
+        operations, ids = [], []
+        for doc in batch:
+            changes = _conversion(name, doc, refs)
+            if changes:
+                # El filtro repite el valor string para no pisar escrituras concurrentes
+                guard = {"_id": doc["_id"], **{field: doc[field] for field in changes}}
+                operations.append(UpdateOne(guard, {"$set": changes}))
+                ids.append(doc["_id"])
+
+        stats["scanned"] += len(batch)
+        if operations and not dry_run:
+            try:
+                result = await collection.bulk_write(operations, ordered=False)
+                stats["converted"] += result.modified_count
+            except BulkWriteError as e:
+                # Con ordered=False el resto del lote se aplica. Un choque típico: contrato activo con
+                # referencias string y otro ya en ObjectId para el mismo par (developer_game_active)
+                stats["converted"] += e.details.get("nModified", 0)
+                for error in e.details.get("writeErrors", []):
+                    conflict_id = ids[error["index"]]
+                    stats["conflicts"].append(str(conflict_id))
+                    logger.warning(f"{name} {conflict_id}: no se pudo convertir ({error.get('errmsg')})")
+        elif dry_run:
+            stats["converted"] += len(operations)
+
+        last_id = batch[-1]["_id"]
+        logger.info(f"{name}: migrados {stats['converted']} de {stats['scanned']} documentos revisados")
+
+    return stats
+
+# Las compras antiguas se agruparon por developer_id string: sus totales se suman a la fila
+# con ObjectId y la fila string se borra, en una transacción (un refresco concurrente choca y reintenta)
+async def merge_developer_rollups(dry_run: bool = False) -> dict:
+    rollup = get_collection(SALES_BY_DEVELOPER)
+    stats = {"scanned": 0, "converted": 0}
+    async for doc in rollup.find({"_id": {"$type": "string"}}):
+        stats["scanned"] += 1
+        if not ObjectId.is_valid(doc["_id"]):
+            logger.warning(f"{SALES_BY_DEVELOPER} {doc['_id']!r}: no es un ObjectId válido")
+            continue
+        stats["converted"] += 1
+        if dry_run:
+            continue
+
+        async def fold(session, string_id=doc["_id"]):
+            # Se relee dentro de la transacción: suma los totales vigentes, no los del recorrido
+            current = await rollup.find_one_and_delete({"_id": string_id}, session=session)
+            if current is None:
+                return
+            await rollup.update_one(
+                {"_id": ObjectId(string_id)},
+                {"$inc": {field: current.get(field, 0) for field in ROLLUP_TOTALS}},
+                upsert=True,
+                session=session
+            )
+
+        await run_transaction(fold)
+    return stats
+
+async def migrate(batch_size: int = 500, dry_run: bool = False) -> dict:
+    stats = {name: await migrate_collection(name, refs, batch_size, dry_run) for name, refs in REFS.items()}
+    stats[SALES_BY_DEVELOPER] = await merge_developer_rollups(dry_run)
+    return stats
+
+async def _main(batch_size: int, dry_run: bool):
+    connect_to_mongo()
+    try:
+        stats = await migrate(batch_size, dry_run)
+    finally:
+        close_mongo_connection()
+    print(stats)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convertir referencias guardadas como string a ObjectId")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Contar sin escribir")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.batch_size, args.dry_run))
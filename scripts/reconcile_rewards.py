@@ -0,0 +1,22 @@
+# Recalcula los saldos de puntos (reward_balances) desde el libro (reward_ledger), por lotes de usuarios
+# Uso: python -m scripts.reconcile_rewards [--batch-size 500] [--dry-run]
+import argparse
+import asyncio
+import logging
+from utils.mongodb import connect_to_mongo, close_mongo_connection
+from controllers.rewards import reconcile_balances
+
+async def _main(batch_size: int, dry_run: bool):
+    connect_to_mongo()
+    try:
+        print(await reconcile_balances(batch_size, dry_run))
+    finally:
+        close_mongo_connection()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconciliar saldos de puntos con el libro de movimientos")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.batch_size, args.dry_run))
@@ -0,0 +1,17 @@
+# Aplica a los rollups de ventas (sales_by_game, sales_by_developer, sales_daily) las compras nuevas
+# Uso: python -m scripts.refresh_sales_rollups
+import asyncio
+import logging
+from utils.mongodb import connect_to_mongo, close_mongo_connection
+from controllers.analytics import refresh_sales_rollups
+
+async def _main():
+    connect_to_mongo()
+    try:
+        print(await refresh_sales_rollups())
+    finally:
+        close_mongo_connection()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
@@ -0,0 +1,146 @@
+import asyncio
+from utils.cache import CountCache, ReadThroughCache
+
+
+def _loader(calls: list, value):
+    async def load():
+        calls.append(value)
+        await asyncio.sleep(0)
+        return value
+    return load
+
+
+def test_hit_after_first_load():
+    cache = ReadThroughCache("test_hit", maxsize=10, ttl=60)
+    calls = []
+
+    async def run():
+        assert await cache.get("a", _loader(calls, 1)) == 1
+        assert await cache.get("a", _loader(calls, 2)) == 1
+
+    asyncio.run(run())
+    assert calls == [1]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_expired_entry_is_reloaded():
+    cache = ReadThroughCache("test_ttl", maxsize=10, ttl=0)
+    calls = []
+
+    async def run():
+        await cache.get("a", _loader(calls, 1))
+        return await cache.get("a", _loader(calls, 2))
+
+    assert asyncio.run(run()) == 2
+    assert calls == [1, 2]
+    assert cache.stats()["hits"] == 0
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ReadThroughCache("test_lru", maxsize=2, ttl=60)
+    calls = []
+
+    async def run():
+        await cache.get("a", _loader(calls, "a"))
+        await cache.get("b", _loader(calls, "b"))
+        await cache.get("a", _loader(calls, "a"))  # "a" pasa a ser la más reciente
+        await cache.get("c", _loader(calls, "c"))  # desaloja "b"
+        await cache.get("a", _loader(calls, "a"))
+        await cache.get("b", _loader(calls, "b"))
+
+    asyncio.run(run())
+    assert calls == ["a", "b", "c", "b"]
+    assert cache.stats()["evictions"] == 2
+    assert cache.stats()["size"] == 2
+
+
+def test_concurrent_misses_share_one_load():
+    cache = ReadThroughCache("test_coalesce", maxsize=10, ttl=60)
+    calls = []
+
+    async def run():
+        return await asyncio.gather(*(cache.get("a", _loader(calls, 1)) for _ in range(5)))
+
+    assert asyncio.run(run()) == [1] * 5
+    assert calls == [1]
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_failed_load_propagates_to_waiters_and_is_not_cached():
+    cache = ReadThroughCache("test_error", maxsize=10, ttl=60)
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("mongo")
+
+    async def run():
+        results = await asyncio.gather(cache.get("a", fail), cache.get("a", fail), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        return await cache.get("a", _loader([], 3))
+
+    assert asyncio.run(run()) == 3
+
+
+def test_invalidate_during_load_does_not_store_stale_value():
+    cache = ReadThroughCache("test_stale", maxsize=10, ttl=60)
+    calls = []
+
+    async def run():
+        pending = asyncio.create_task(cache.get("a", _loader(calls, "old")))
+        await asyncio.sleep(0)
+        cache.invalidate("a")
+        assert await pending == "old"
+        return await cache.get("a", _loader(calls, "new"))
+
+    assert asyncio.run(run()) == "new"
+    assert calls == ["old", "new"]
+
+
+def test_invalidate_removes_entry():
+    cache = ReadThroughCache("test_invalidate", maxsize=10, ttl=60)
+    calls = []
+
+    async def run():
+        await cache.get("a", _loader(calls, 1))
+        cache.invalidate("a")
+        await cache.get("a", _loader(calls, 2))
+
+    asyncio.run(run())
+    assert calls == [1, 2]
+
+
+def test_count_cache_is_keyed_by_collection_and_filter():
+    counts = CountCache(ttl=60)
+    counts.set("games", {"active": True, "status": "demo"}, 7)
+    assert counts.get("games", {"status": "demo", "active": True}) == 7
+    assert counts.get("games", {"active": True}) is None
+    assert counts.get("contracts", {"active": True, "status": "demo"}) is None
+
+
+def test_count_cache_expires_and_invalidates_by_collection():
+    counts = CountCache(ttl=-1)
+    counts.set("games", {}, 3)
+    assert counts.get("games", {}) is None
+
+    counts = CountCache(ttl=60)
+    counts.set("games", {}, 3)
+    counts.set("contracts", {}, 4)
+    counts.invalidate("games")
+    assert counts.get("games", {}) is None
+    assert counts.get("contracts", {}) == 4
+
+
+def test_count_cache_selectivity_is_capped():
+    counts = CountCache(ttl=60)
+    counts.set_selectivity("games", {"active": True}, 30, 120)
+    counts.set_selectivity("games", {"status": "demo"}, 150, 120)
+    counts.set_selectivity("games", {"status": "oferta"}, 5, 0)
+    assert counts.selectivity("games", {"active": True}) == 0.25
+    assert counts.selectivity("games", {"status": "demo"}) == 1.0
+    assert counts.selectivity("games", {"status": "oferta"}) is None
+
+
+def test_count_cache_selectivity_expires_with_the_counts():
+    counts = CountCache(ttl=-1)
+    counts.set_selectivity("games", {"active": True}, 30, 120)
+    assert counts.selectivity("games", {"active": True}) is None
@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+
+pytest.importorskip("motor")
+pytest.importorskip("dotenv")
+
+from utils import change_streams
+
+
+class FakeTokens:
+    """Colección change_stream_tokens en memoria (find_one / update_one con $set y upsert)."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.setdefault(query["_id"], {"_id": query["_id"]})
+        doc.update(update["$set"])
+
+
+class FakeStream:
+    """Change stream que entrega unos eventos y luego simula el apagado (cancelación)."""
+
+    def __init__(self, events):
+        self.events = events
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for event in self.events:
+            self.resume_token = event["_id"]
+            yield event
+        raise asyncio.CancelledError()
+
+
+class FakeDb:
+    def __init__(self, events):
+        self.events = events
+        self.resume_after = []
+
+    def watch(self, pipeline, resume_after=None):
+        self.resume_after.append(resume_after)
+        return FakeStream(self.events)
+
+
+def _event(n):
+    return {"_id": {"_data": f"token-{n}"}, "operationType": "update", "ns": {"coll": "games"}, "documentKey": {}}
+
+
+def _run(db, tokens, monkeypatch):
+    monkeypatch.setattr(change_streams, "connect_to_mongo", lambda: db)
+    monkeypatch.setattr(change_streams, "get_collection", lambda name: tokens)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(change_streams.watch_changes())
+
+
+def test_token_is_saved_on_shutdown_and_resumed_after_restart(monkeypatch):
+    tokens = FakeTokens()
+
+    first = FakeDb([_event(1), _event(2)])
+    _run(first, tokens, monkeypatch)
+    assert first.resume_after == [None]
+    assert tokens.docs[change_streams.CONSUMER_ID]["token"] == {"_data": "token-2"}
+
+    restarted = FakeDb([_event(3)])
+    _run(restarted, tokens, monkeypatch)
+    assert restarted.resume_after == [{"_data": "token-2"}]
+    assert tokens.docs[change_streams.CONSUMER_ID]["token"] == {"_data": "token-3"}
+
+
+def test_token_is_saved_periodically(monkeypatch):
+    tokens = FakeTokens()
+    saved = []
+    original = FakeTokens.update_one
+
+    async def record(self, query, update, upsert=False):
+        saved.append(update["$set"]["token"]["_data"])
+        await original(self, query, update, upsert)
+
+    monkeypatch.setattr(FakeTokens, "update_one", record)
+    monkeypatch.setattr(change_streams, "TOKEN_SAVE_EVERY", 2)
+    _run(FakeDb([_event(n) for n in range(1, 6)]), tokens, monkeypatch)
+    assert saved == ["token-2", "token-4", "token-5"]
+
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("dotenv")
+
+from utils.etag import make_etag, etag_matches, cache_headers, not_modified
+
+
+def test_make_etag_is_stable_and_quoted():
+    etag = make_etag("games", 3, 0, 10)
+    assert etag == make_etag("games", 3, 0, 10)
+    assert etag != make_etag("games", 4, 0, 10)
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_matches_single_tag():
+    etag = make_etag("games", 1)
+    assert etag_matches(etag, etag)
+    assert not etag_matches(make_etag("games", 2), etag)
+
+
+def test_matches_any_tag_of_a_list():
+    etag = make_etag("games", 1)
+    header = f'{make_etag("games", 0)}, {etag} ,{make_etag("otro")}'
+    assert etag_matches(header, etag)
+    assert not etag_matches(f'{make_etag("games", 0)}, {make_etag("otro")}', etag)
+
+
+def test_weak_tags_match_with_weak_comparison():
+    etag = make_etag("games", 1)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches(f'{make_etag("games", 0)}, W/{etag}', etag)
+
+
+def test_wildcard_and_missing_header():
+    etag = make_etag("games", 1)
+    assert etag_matches("*", etag)
+    assert etag_matches(" * ", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+
+
+def test_not_modified_has_no_body_and_keeps_headers():
+    etag = make_etag("games", 1)
+    response = not_modified(etag, "public, max-age=5")
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == etag
+    assert cache_headers(etag, "no-cache") == {"ETag": etag, "Cache-Control": "no-cache"}
@@ -0,0 +1,54 @@
+import base64
+from datetime import datetime, timezone
+import pytest
+
+pytest.importorskip("bson")
+pytest.importorskip("fastapi")
+
+from bson import ObjectId
+from fastapi import HTTPException
+from utils.pagination import (
+    encode_cursor, decode_cursor, decode_cursor_values, decode_created_cursor, created_page
+)
+
+OID = "65f1c2a9e4b0a1b2c3d4e5f6"
+
+
+def test_cursor_round_trip_keeps_id_and_sort_values():
+    oid, values = decode_cursor_values(encode_cursor(OID, score=1.5, title="Dragón"))
+    assert oid == ObjectId(OID)
+    assert values == {"score": 1.5, "title": "Dragón"}
+    assert decode_cursor(encode_cursor(OID)) == ObjectId(OID)
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(OID, score=0.333)
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+def test_created_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    docs = [{"id": OID, "created_at": created_at}, {"id": str(ObjectId()), "created_at": created_at}]
+    page, cursor = created_page(docs, 1)
+    assert page == docs[:1]
+    assert decode_created_cursor(cursor) == (ObjectId(OID), created_at)
+    assert created_page(docs, 2) == (docs, None)
+
+
+@pytest.mark.parametrize("cursor", [
+    "no-es-base64!",
+    base64.urlsafe_b64encode(b"no es json").decode(),
+    base64.urlsafe_b64encode(b'["lista"]').decode(),
+    encode_cursor("123"),
+    encode_cursor(None),
+])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor_values(cursor)
+    assert error.value.status_code == 400
+
+
+def test_created_cursor_without_date_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        decode_created_cursor(encode_cursor(OID, created_at="ayer"))
+    assert error.value.status_code == 400
@@ -0,0 +1,73 @@
+from utils.prefix_index import PrefixIndex
+
+
+def _ids(results):
+    return [item["id"] for item in results]
+
+
+def _index():
+    index = PrefixIndex()
+    index.load([
+        ("1", "Dragon Quest", 10),
+        ("2", "Dragón Ball", 50),
+        ("3", "Dark Souls", 30),
+        ("4", "Legend of Dragoon", 5),
+    ])
+    return index
+
+
+def test_suggest_orders_by_popularity():
+    assert _ids(_index().suggest("dra")) == ["2", "1", "4"]
+
+
+def test_suggest_matches_any_word_of_the_title():
+    assert _ids(_index().suggest("soul")) == ["3"]
+
+
+def test_suggest_folds_accents_and_case():
+    index = _index()
+    assert _ids(index.suggest("DRAGÓN")) == ["2", "1"]
+    assert index.suggest("dragon")[0]["title"] == "Dragón Ball"
+
+
+def test_suggest_with_several_words_requires_the_complete_ones():
+    index = _index()
+    assert _ids(index.suggest("dragon qu")) == ["1"]
+    assert _ids(index.suggest("legend of dra")) == ["4"]
+    assert index.suggest("souls dra") == []
+
+
+def test_suggest_respects_limit_and_empty_prefix():
+    index = _index()
+    assert _ids(index.suggest("d", limit=2)) == ["2", "3"]
+    assert index.suggest("  ") == []
+
+
+def test_add_replaces_existing_title():
+    index = _index()
+    index.add("1", "Final Fantasy", 10)
+    assert _ids(index.suggest("drag")) == ["2", "4"]
+    assert _ids(index.suggest("fin")) == ["1"]
+    assert len(index) == 4
+
+
+def test_remove_drops_item_and_empty_keys():
+    index = _index()
+    index.remove("3")
+    index.remove("missing")
+    assert index.suggest("soul") == []
+    assert index.stats()["items"] == 3
+
+
+def test_set_popularity_reorders_results():
+    index = _index()
+    index.set_popularity("4", 100)
+    assert _ids(index.suggest("dra")) == ["4", "2", "1"]
+    assert index.suggest("dra")[0]["popularity"] == 100
+
+
+def test_short_prefix_cache_is_invalidated_on_change():
+    index = _index()
+    assert _ids(index.suggest("d")) == ["2", "3", "1", "4"]
+    index.add("5", "Doom", 99)
+    assert _ids(index.suggest("d"))[0] == "5"
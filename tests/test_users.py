@@ -0,0 +1,24 @@
+import pytest
+
+pytest.importorskip("pydantic")
+
+from models.users import User
+
+PAYLOAD = {
+    "name_profile": "Ana_López",
+    "email": "ana@example.com",
+    "password": "Password123!",
+    "date_birth": "2000-05-30",
+}
+
+
+def test_self_registration_cannot_grant_admin():
+    user = User(**PAYLOAD, admin=True, active=False).for_registration()
+    stored = user.model_dump(exclude={"id", "password"})
+    assert stored["admin"] is False
+    assert stored["active"] is True
+    assert stored["email"] == PAYLOAD["email"]
+
+
+def test_registration_keeps_defaults():
+    assert User(**PAYLOAD).for_registration().admin is False
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+
+# Clave estable para un filtro de Mongo (ObjectId/fechas se serializan como texto)
+def filter_key(query: dict) -> str:
+    return json.dumps(query, sort_keys=True, default=str)
+
+
+class CountCache:
+    """Totales de count_documents por (colección, filtro) con TTL.
+
+    También guarda la selectividad de cada filtro (total exacto / total estimado de
+    la colección) para poder aproximar totales filtrados sin escanear; caduca con el
+    mismo TTL que los totales, así se recalcula si la proporción cambia.
+    """
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._selectivity = {}
+
+    def get(self, collection: str, query: dict):
+        entry = self._entries.get((collection, filter_key(query)))
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            self._entries.pop((collection, filter_key(query)), None)
+            return None
+        return value
+
+    def set(self, collection: str, query: dict, value: int):
+        self._entries[(collection, filter_key(query))] = (value, time.monotonic() + self.ttl)
+
+    def set_selectivity(self, collection: str, query: dict, exact: int, estimated: int):
+        if estimated:
+            ratio = min(exact / estimated, 1.0)
+            self._selectivity[(collection, filter_key(query))] = (ratio, time.monotonic() + self.ttl)
+
+    def selectivity(self, collection: str, query: dict):
+        key = (collection, filter_key(query))
+        entry = self._selectivity.get(key)
+        if entry is None:
+            return None
+        ratio, expires_at = entry
+        if expires_at < time.monotonic():
+            self._selectivity.pop(key, None)
+            return None
+        return ratio
+
+    # Se llama en cada escritura sobre la colección
+    def invalidate(self, collection: str):
+        for key in [k for k in self._entries if k[0] == collection]:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._selectivity.clear()
+
+
+count_cache = CountCache()
+
+
+READ_CACHE_SIZE = int(os.getenv("READ_CACHE_SIZE", "10000"))
+READ_CACHE_TTL = float(os.getenv("READ_CACHE_TTL_SECONDS", "300"))
+
+# Cachés de lectura por colección (para métricas e invalidación externa)
+CACHE_REGISTRY = {}
+
+
+class ReadThroughCache:
+    """Caché asíncrona read-through con tamaño máximo, TTL y desalojo LRU.
+
+    Las lecturas concurrentes de una misma clave ausente comparten una sola consulta.
+    Los valores se comparten entre peticiones: no deben modificarse.
+    """
+
+    def __init__(self, name: str, maxsize: int = READ_CACHE_SIZE, ttl: float = READ_CACHE_TTL):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._stale = set()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        CACHE_REGISTRY[name] = self
+
+    async def get(self, key, loader):
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # evitar el aviso si nadie más esperaba
+            raise
+        else:
+            # Si se invalidó mientras se cargaba, no se guarda el valor viejo
+            if key not in self._stale:
+                self._store(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._pending.pop(key, None)
+            self._stale.discard(key)
+
+    def _store(self, key, value):
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+        if key in self._pending:
+            self._stale.add(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._stale.update(self._pending)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions
+        }
+
+
+# Exposición en formato de texto de Prometheus
+def cache_metrics_text() -> str:
+    lines = []
+    for metric in ("hits", "misses", "coalesced", "evictions", "size"):
+        kind = "gauge" if metric == "size" else "counter"
+        name = f"read_cache_{metric}" if metric == "size" else f"read_cache_{metric}_total"
+        lines.append(f"# TYPE {name} {kind}")
+        for cache_name, cache in CACHE_REGISTRY.items():
+            lines.append(f'{name}{{cache="{cache_name}"}} {cache.stats()[metric]}')
+    return "\n".join(lines) + "\n"
+
+
+games_cache = ReadThroughCache("games")
+developers_cache = ReadThroughCache("developers")
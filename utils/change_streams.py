@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import os
+import socket
+from pymongo.errors import OperationFailure, PyMongoError
+from utils.mongodb import get_collection, connect_to_mongo
+from utils.cache import CACHE_REGISTRY, count_cache
+
+logger = logging.getLogger(__name__)
+
+CHANGE_STREAMS_ENABLED = os.getenv("CHANGE_STREAMS_ENABLED", "true").lower() == "true"
+# Identificador estable: el proceso que reinicia retoma el resume token de su antecesor.
+# Con varios workers en la misma máquina, cada uno debe fijar su CHANGE_STREAM_CONSUMER
+CONSUMER_ID = os.getenv("CHANGE_STREAM_CONSUMER") or socket.gethostname()
+TOKEN_SAVE_EVERY = int(os.getenv("CHANGE_STREAM_TOKEN_SAVE_EVERY", "50"))
+RETRY_SECONDS = float(os.getenv("CHANGE_STREAM_RETRY_SECONDS", "5"))
+
+# Colecciones con cachés en memoria que hay que mantener coherentes entre workers
+WATCHED_COLLECTIONS = ["games", "developers", "contract_types", "users"]
+TOKENS_COLLECTION = "change_stream_tokens"
+
+# Códigos de Mongo: sin replica set / historial del oplog perdido
+NOT_SUPPORTED_CODES = {40573, 20}
+HISTORY_LOST_CODES = {286, 280}
+
+# Índices en memoria que necesitan el evento completo (p. ej. sugerencias de títulos)
+LISTENERS = {}
+
+def register_listener(collection: str, callback):
+    LISTENERS.setdefault(collection, []).append(callback)
+
+async def _notify(event: dict):
+    collection = event.get("ns", {}).get("coll")
+    for callback in LISTENERS.get(collection, []):
+        try:
+            await callback(event)
+        except Exception:
+            # Un listener que falla no debe cortar el change stream ni a los demás listeners
+            logger.exception("Error aplicando evento de %s", collection)
+
+def _clear_caches():
+    for name in WATCHED_COLLECTIONS:
+        count_cache.invalidate(name)
+        if name in CACHE_REGISTRY:
+            CACHE_REGISTRY[name].clear()
+
+# Aplicar un evento a las cachés locales
+def apply_event(event: dict):
+    collection = event.get("ns", {}).get("coll")
+    operation = event.get("operationType")
+    if operation in ("drop", "rename", "dropDatabase", "invalidate"):
+        _clear_caches()
+        return
+    if collection is None:
+        return
+    count_cache.invalidate(collection)
+    cache = CACHE_REGISTRY.get(collection)
+    document_key = event.get("documentKey") or {}
+    if cache is not None and "_id" in document_key:
+        cache.invalidate(str(document_key["_id"]))
+
+async def _load_token():
+    doc = await get_collection(TOKENS_COLLECTION).find_one({"_id": CONSUMER_ID})
+    return doc["token"] if doc else None
+
+async def _save_token(token):
+    if token is None:
+        return
+    try:
+        await get_collection(TOKENS_COLLECTION).update_one(
+            {"_id": CONSUMER_ID}, {"$set": {"token": token}}, upsert=True
+        )
+    except PyMongoError as e:
+        logger.warning("No se pudo guardar el resume token: %s", e)
+
+# Seguir los cambios de la base y publicar invalidaciones; si no hay change streams, quedan los TTL
+async def watch_changes():
+    db = connect_to_mongo()
+    pipeline = [{"$match": {"ns.coll": {"$in": WATCHED_COLLECTIONS}}}]
+    try:
+        token = await _load_token()
+    except PyMongoError as e:
+        logger.warning("No se pudo leer el resume token: %s", e)
+        token = None
+
+    while True:
+        processed = 0
+        try:
+            async with db.watch(pipeline, resume_after=token) as stream:
+                logger.info("Change streams activos (consumidor %s)", CONSUMER_ID)
+                async for event in stream:
+                    apply_event(event)
+                    await _notify(event)
+                    token = stream.resume_token
+                    processed += 1
+                    if processed % TOKEN_SAVE_EVERY == 0:
+                        await _save_token(token)
+        except asyncio.CancelledError:
+            await asyncio.shield(_save_token(token))
+            raise
+        except OperationFailure as e:
+            if e.code in NOT_SUPPORTED_CODES:
+                logger.warning("Change streams no disponibles (%s); las cachés dependen del TTL", e)
+                return
+            if e.code in HISTORY_LOST_CODES:
+                # El token ya no está en el oplog: se limpia todo y se empieza desde ahora
+                logger.warning("Resume token caducado; se vacían las cachés locales")
+                _clear_caches()
+                token = None
+                continue
+            logger.error("Error en change stream: %s", e)
+        except PyMongoError as e:
+            logger.error("Error en change stream: %s", e)
+
+        # Reconexión: con token se reanuda sin perder eventos; sin token se vacían las cachés
+        await _save_token(token)
+        if token is None:
+            _clear_caches()
+        await asyncio.sleep(RETRY_SECONDS)
+
+def start_change_streams():
+    if not CHANGE_STREAMS_ENABLED:
+        return None
+    return asyncio.create_task(watch_changes())
+
+async def stop_change_streams(task):
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except (asyncio.CancelledError, PyMongoError):
+        pass
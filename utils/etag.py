@@ -0,0 +1,28 @@
+import hashlib
+import os
+from fastapi import Response
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GAMES_CACHE_CONTROL = os.getenv("GAMES_CACHE_CONTROL", "public, max-age=60")
+
+# ETag fuerte a partir de las partes que identifican la representación
+def make_etag(*parts) -> str:
+    raw = ":".join(str(part) for part in parts)
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+def cache_headers(etag: str, cache_control: str = GAMES_CACHE_CONTROL) -> dict:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+# 304 sin cuerpo: no se serializa nada
+def not_modified(etag: str, cache_control: str = GAMES_CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
@@ -0,0 +1,26 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+BLOCKING_WORKERS = int(os.getenv("BLOCKING_WORKERS", "8"))
+
+executor = None
+
+# Pool acotado para llamadas bloqueantes (SDK de Firebase Admin, hashing, etc.)
+def start_executor():
+    global executor
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="blocking")
+    return executor
+
+def shutdown_executor():
+    global executor
+    if executor is not None:
+        executor.shutdown(wait=True)
+    executor = None
+
+# Ejecutar una función bloqueante sin detener el event loop
+async def run_blocking(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(start_executor(), partial(func, *args, **kwargs))
@@ -0,0 +1,55 @@
+import csv
+import io
+from typing import Literal
+import orjson
+from fastapi.responses import StreamingResponse
+from utils.responses import bson_default
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Una línea JSON por documento; se emite un chunk por lote del cursor
+async def ndjson_chunks(docs, batch_size: int):
+    buffer = []
+    async for doc in docs:
+        buffer.append(orjson.dumps(doc, default=bson_default))
+        if len(buffer) >= batch_size:
+            yield b"\n".join(buffer) + b"\n"
+            buffer = []
+    if buffer:
+        yield b"\n".join(buffer) + b"\n"
+
+async def csv_chunks(docs, fields: list, batch_size: int):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    rows = 0
+    async for doc in docs:
+        writer.writerow(doc)
+        rows += 1
+        if rows >= batch_size:
+            yield out.getvalue().encode()
+            out.seek(0)
+            out.truncate(0)
+            rows = 0
+    if out.tell():
+        yield out.getvalue().encode()
+
+# Respuesta chunked desde un cursor asíncrono: memoria constante sin importar el tamaño de la colección
+def export_response(repo, query: dict, fields: list, fmt: ExportFormat = "ndjson",
+                    batch_size: int = 500, filename: str = "export") -> StreamingResponse:
+    projection = {field: 1 for field in fields if field != "id"}
+    docs = repo.iterate(query, projection, sort=[("_id", 1)], batch_size=batch_size)
+    if fmt == "csv":
+        body = csv_chunks(docs, fields, batch_size)
+    else:
+        body = ndjson_chunks(docs, batch_size)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import os
+import time
+import httpx
+from fastapi import HTTPException
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+FIREBASE_AUTH_BASE_URL = os.getenv("FIREBASE_AUTH_BASE_URL", "https://identitytoolkit.googleapis.com")
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+FIREBASE_MAX_CONCURRENCY = int(os.getenv("FIREBASE_MAX_CONCURRENCY", "50"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("FIREBASE_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("FIREBASE_BREAKER_RESET_SECONDS", "30"))
+
+client = None
+
+# Cliente HTTP compartido con keep-alive (se abre y cierra en el lifespan)
+def start_http_client():
+    global client
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE
+            )
+        )
+    return client
+
+async def close_http_client():
+    global client
+    if client is not None:
+        await client.aclose()
+    client = None
+
+def get_http_client():
+    if client is None:
+        start_http_client()
+    return client
+
+
+class CircuitBreaker:
+    """Corta las llamadas a un servicio degradado durante reset_timeout segundos.
+
+    Tras failure_threshold fallos seguidos se abre; pasado el tiempo deja pasar una sola
+    llamada de prueba (half-open) y se cierra si tiene éxito. Mientras la prueba está en
+    curso el resto se rechaza; si no se resuelve (p. ej. se cancela), tras reset_timeout
+    se permite otra.
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        now = time.monotonic()
+        if self.probe_started_at is not None and now - self.probe_started_at < self.reset_timeout:
+            return False
+        self.probe_started_at = now
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.probe_started_at = None
+
+
+firebase_breaker = CircuitBreaker()
+firebase_semaphore = asyncio.Semaphore(FIREBASE_MAX_CONCURRENCY)
+
+# POST a Identity Toolkit con timeouts, concurrencia acotada y circuit breaker
+async def firebase_post(path: str, payload: dict, api_key: str) -> dict:
+    if not firebase_breaker.allow():
+        raise HTTPException(status_code=503, detail="Servicio de autenticación no disponible")
+
+    async with firebase_semaphore:
+        try:
+            response = await get_http_client().post(
+                f"{FIREBASE_AUTH_BASE_URL}{path}",
+                params={"key": api_key},
+                json=payload
+            )
+        except httpx.HTTPError as e:
+            firebase_breaker.record_failure()
+            logger.warning(f"Error de red con Firebase: {e}")
+            raise HTTPException(status_code=503, detail="Servicio de autenticación no disponible")
+
+    if response.status_code >= 500:
+        firebase_breaker.record_failure()
+        raise HTTPException(status_code=503, detail="Servicio de autenticación no disponible")
+    firebase_breaker.record_success()
+
+    try:
+        return response.json()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error inesperado al procesar respuesta de Firebase: {e}"
+        )
@@ -0,0 +1,233 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure, PyMongoError
+from utils.mongodb import get_collection, connect_to_mongo, close_mongo_connection
+
+logger = logging.getLogger(__name__)
+
+SYNC_ON_STARTUP = os.getenv("INDEX_SYNC_ON_STARTUP", "true").lower() == "true"
+
+ACTIVE_ONLY = {"active": True}
+
+# Comparación sin distinguir mayúsculas/minúsculas (strength 2)
+CASE_INSENSITIVE = {"locale": "es", "strength": 2}
+
+# Definir un índice: keys es una lista de (campo, dirección)
+def index(keys, name, unique=False, partial=None, ttl=None, collation=None, **options):
+    spec = {"keys": list(keys), "name": name, **options}
+    if unique:
+        spec["unique"] = True
+    if partial is not None:
+        spec["partialFilterExpression"] = partial
+    if ttl is not None:
+        spec["expireAfterSeconds"] = ttl
+    if collation is not None:
+        spec["collation"] = collation
+    return spec
+
+# Índices declarados por colección (el _id_ de Mongo se da por hecho; cubre los $lookup por _id)
+INDEXES = {
+    "users": [
+        index([("email", ASCENDING)], "email_unique", unique=True),
+    ],
+    "games": [
+        index([("active", ASCENDING), ("_id", ASCENDING)], "active_id"),
+        index([("title", ASCENDING)], "title_unique_ci", unique=True, collation=CASE_INSENSITIVE),
+        # Búsqueda: texto completo en español (sin distinguir tildes) y prefijos por palabra
+        index(
+            [("title", TEXT), ("description", TEXT)], "title_description_text",
+            partial=ACTIVE_ONLY, weights={"title": 10, "description": 1}, default_language="spanish"
+        ),
+        index([("search_terms", ASCENDING)], "search_terms", partial=ACTIVE_ONLY),
+        # Filtros de /games/browse
+        index([("active", ASCENDING), ("status", ASCENDING), ("price", ASCENDING)], "active_status_price"),
+        index([("active", ASCENDING), ("developer_id", ASCENDING), ("_id", ASCENDING)], "active_developer_id"),
+        index([("active", ASCENDING), ("release_date", ASCENDING)], "active_release_date"),
+        # Propagación del nombre del desarrollador (también a juegos inactivos)
+        index([("developer_id", ASCENDING)], "developer_id"),
+    ],
+    "developers": [
+        index([("active", ASCENDING), ("_id", ASCENDING)], "active_id"),
+    ],
+    "contract_types": [
+        index([("active", ASCENDING), ("_id", ASCENDING)], "active_id"),
+        index([("description", ASCENDING)], "description_unique_ci", unique=True, collation=CASE_INSENSITIVE),
+    ],
+    "contracts": [
+        index([("active", ASCENDING), ("_id", ASCENDING)], "active_id"),
+        # Un developer solo puede tener un contrato activo por juego
+        index([("developer_id", ASCENDING), ("game_id", ASCENDING)], "developer_game_active", unique=True, partial=ACTIVE_ONLY),
+        # Propagación de nombres, títulos y descripciones copiados en los contratos
+        index([("developer_id", ASCENDING)], "developer_id"),
+        index([("game_id", ASCENDING)], "game_id"),
+        index([("type_contract_id", ASCENDING)], "type_contract_id"),
+    ],
+    "purchases": [
+        index([("active", ASCENDING), ("_id", ASCENDING)], "active_id"),
+        # Historial por usuario con cursor (created_at, _id): no depende del total de compras
+        index([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], "user_created_at"),
+        # Un usuario no puede comprar dos veces el mismo juego (reintentos del checkout)
+        index([("user_id", ASCENDING), ("game_id", ASCENDING)], "user_game_active", unique=True, partial=ACTIVE_ONLY),
+        # Ventanas de refresco de los rollups de ventas
+        index([("created_at", ASCENDING)], "created_at"),
+        index([("refunded_at", ASCENDING)], "refunded_at", partial={"refunded_at": {"$exists": True}}),
+    ],
+    "sales_by_game": [
+        index([("revenue", DESCENDING)], "revenue"),
+    ],
+    "sales_by_developer": [
+        index([("revenue", DESCENDING)], "revenue"),
+    ],
+    "wishlist": [
+        # Alta/baja idempotentes; también cubre la consulta de pertenencia por lote ($in sobre game_id)
+        index([("user_id", ASCENDING), ("game_id", ASCENDING)], "user_game_unique", unique=True),
+        index([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], "user_created_at"),
+        # Recorrido por lotes de los interesados en un juego (avisos de bajada de precio)
+        index([("game_id", ASCENDING), ("_id", ASCENDING)], "game_id"),
+    ],
+    "notification_jobs": [
+        index([("state", ASCENDING), ("lease_until", ASCENDING), ("created_at", ASCENDING)], "state_lease"),
+    ],
+    "notifications": [
+        # Reanudar un lote no duplica avisos
+        index([("job_id", ASCENDING), ("user_id", ASCENDING)], "job_user_unique", unique=True),
+    ],
+    "reward_ledger": [
+        index([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], "user_created_at"),
+        # Cada compra suma (y, si se reembolsa, resta) sus puntos una sola vez
+        index(
+            [("purchase_id", ASCENDING), ("reason", ASCENDING)], "purchase_reason_unique",
+            unique=True, partial={"purchase_id": {"$exists": True}}
+        ),
+    ],
+}
+
+OPTION_FIELDS = ("unique", "partialFilterExpression", "expireAfterSeconds")
+TEXT_OPTION_FIELDS = ("weights", "default_language")
+
+# Comparar un índice existente con su declaración (la collation de Mongo trae valores por defecto, solo se comparan los declarados)
+def _matches(spec: dict, existing: dict) -> bool:
+    if any(direction == TEXT for _, direction in spec["keys"]):
+        # Mongo guarda los índices de texto como {_fts, _ftsx}: se comparan pesos e idioma
+        if "_fts" not in existing["key"]:
+            return False
+        weights = spec.get("weights") or {field: 1 for field, _ in spec["keys"]}
+        if dict(existing.get("weights", {})) != weights:
+            return False
+        if existing.get("default_language", "english") != spec.get("default_language", "english"):
+            return False
+    elif list(existing["key"].items()) != [tuple(k) for k in spec["keys"]]:
+        return False
+    for field in OPTION_FIELDS:
+        if spec.get(field) != existing.get(field):
+            return False
+    existing_collation = existing.get("collation") or {}
+    for field, value in (spec.get("collation") or {}).items():
+        if existing_collation.get(field) != value:
+            return False
+    return "collation" in spec or "collation" not in existing
+
+def _model(spec: dict) -> IndexModel:
+    options = {k: v for k, v in spec.items() if k not in ("keys",)}
+    return IndexModel(spec["keys"], **options)
+
+INDEX_NOT_FOUND = 27
+# Mongo no admite dos índices con la misma clave y opciones incompatibles (ni dos de texto)
+INDEX_CONFLICT_CODES = (85, 86)
+
+async def _drop_index(collection, index_name: str):
+    try:
+        await collection.drop_index(index_name)
+    except OperationFailure as e:
+        if e.code != INDEX_NOT_FOUND:
+            raise
+
+# Reconstruir sin dejar la colección sin índice: primero se construye una copia con nombre
+# temporal, luego se sustituye el original y se borra la copia. Si Mongo no admite la copia
+# (clave idéntica con opciones incompatibles), se borra y se crea de nuevo
+async def _rebuild_index(collection, spec: dict):
+    temp_name = f"{spec['name']}__rebuild"
+    try:
+        await collection.create_indexes([_model({**spec, "name": temp_name})])
+    except OperationFailure as e:
+        if e.code not in INDEX_CONFLICT_CODES:
+            raise
+        temp_name = None
+        logger.warning("Índice %s.%s: no admite copia temporal, se reconstruye en el sitio", collection.name, spec["name"])
+    await _drop_index(collection, spec["name"])
+    await collection.create_indexes([_model(spec)])
+    if temp_name:
+        await _drop_index(collection, temp_name)
+
+# Sincronizar una colección: crea los que faltan, reporta los no declarados y, solo con
+# rebuild=True (CLI), reconstruye los que cambiaron
+async def sync_collection(name: str, specs: list, dry_run: bool = False, rebuild: bool = False) -> dict:
+    collection = get_collection(name)
+    existing = {info["name"]: info async for info in collection.list_indexes()}
+    report = {"create": [], "rebuild": [], "undeclared": [], "ok": []}
+
+    for spec in specs:
+        current = existing.get(spec["name"])
+        if current is None:
+            report["create"].append(spec["name"])
+        elif not _matches(spec, current):
+            report["rebuild"].append(spec["name"])
+        else:
+            report["ok"].append(spec["name"])
+
+    declared = {spec["name"] for spec in specs}
+    report["undeclared"] = sorted(n for n in existing if n != "_id_" and n not in declared)
+
+    if not dry_run:
+        to_create = [_model(s) for s in specs if s["name"] in report["create"]]
+        if to_create:
+            await collection.create_indexes(to_create)
+        if rebuild:
+            for spec in specs:
+                if spec["name"] in report["rebuild"]:
+                    await _rebuild_index(collection, spec)
+    return report
+
+# Al arrancar (rebuild=False) solo se crean los índices que faltan; un fallo en una colección
+# se registra y no impide arrancar ni sincronizar las demás
+async def sync_indexes(dry_run: bool = False, rebuild: bool = False) -> dict:
+    report = {}
+    for name, specs in INDEXES.items():
+        try:
+            report[name] = await sync_collection(name, specs, dry_run, rebuild)
+        except PyMongoError as e:
+            logger.exception("No se pudieron sincronizar los índices de %s", name)
+            report[name] = {"error": str(e)}
+            continue
+        summary = report[name]
+        if summary["create"] or summary["rebuild"] or summary["undeclared"]:
+            logger.info(
+                "Índices %s: crear=%s reconstruir=%s no declarados=%s%s",
+                name, summary["create"], summary["rebuild"], summary["undeclared"],
+                " (dry-run)" if dry_run else ""
+            )
+        if summary["rebuild"] and not rebuild and not dry_run:
+            logger.warning(
+                "Índices %s distintos de su declaración: reconstruir con python -m utils.indexes", name
+            )
+    return report
+
+# python -m utils.indexes [--dry-run]: aplica también las reconstrucciones
+async def _main(dry_run: bool):
+    connect_to_mongo()
+    try:
+        report = await sync_indexes(dry_run, rebuild=True)
+    finally:
+        close_mongo_connection()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sincronizar (y reconstruir) los índices declarados de MongoDB")
+    parser.add_argument("--dry-run", action="store_true", help="Mostrar las diferencias sin aplicarlas")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.dry_run))
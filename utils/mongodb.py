@@ -0,0 +1,55 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+import os
+
+# Cargar variables de entorno
+load_dotenv()
+
+DB = os.getenv("MONGO_DB_NAME")
+URI = os.getenv("URI")
+
+# Tamaño del pool de conexiones (por worker de uvicorn)
+MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "200"))
+MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+
+client = None
+db = None
+
+# Crear el cliente asíncrono (se llama desde el lifespan de FastAPI)
+def connect_to_mongo():
+    global client, db
+    if client is None:
+        client = AsyncIOMotorClient(
+            URI,
+            maxPoolSize=MAX_POOL_SIZE,
+            minPoolSize=MIN_POOL_SIZE,
+            serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+        )
+        db = client[DB]
+    return db
+
+# Cerrar el cliente y liberar el pool de conexiones
+def close_mongo_connection():
+    global client, db
+    if client is not None:
+        client.close()
+    client = None
+    db = None
+
+def get_client():
+    if client is None:
+        connect_to_mongo()
+    return client
+
+# Ejecutar callback(session) en una transacción multi-documento (requiere replica set);
+# with_transaction reintenta los errores transitorios y el commit incierto
+async def run_transaction(callback, **options):
+    async with await get_client().start_session() as session:
+        return await session.with_transaction(callback, **options)
+
+# Función para obtener una colección
+def get_collection(name):
+    if db is None:
+        connect_to_mongo()
+    return db[name]
@@ -0,0 +1,94 @@
+import base64
+import json
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import HTTPException
+from utils.repository import to_object_id
+from utils.cache import count_cache
+
+# Modos de cálculo del total en los listados
+TotalMode = Literal["exact", "cached", "estimated", "none"]
+
+# Cursor opaco: base64url de {"id": <último _id de la página>, ...claves de orden}
+def encode_cursor(last_id: str, **sort_values) -> str:
+    raw = json.dumps({"id": last_id, **sort_values}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+# Devuelve el ObjectId y el resto de valores de orden guardados en el cursor
+def decode_cursor_values(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        oid = to_object_id(data.pop("id", None))
+    except (ValueError, TypeError, AttributeError):
+        oid = None
+    if oid is None:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return oid, data
+
+def decode_cursor(cursor: str):
+    return decode_cursor_values(cursor)[0]
+
+# Cursor de listados ordenados por (created_at, _id) descendente
+def decode_created_cursor(cursor: str):
+    oid, values = decode_cursor_values(cursor)
+    try:
+        return oid, datetime.fromisoformat(values["created_at"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+# Recortar la página (se pidió limit + 1) y generar el cursor (created_at, _id) de la siguiente
+def created_page(docs: list, limit: int):
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    last = docs[-1]
+    return docs, encode_cursor(last["id"], created_at=last["created_at"].isoformat())
+
+async def exact_count(repo, query: dict) -> int:
+    total = await repo.count(query)
+    count_cache.set(repo.collection_name, query, total)
+    return total
+
+# Total aproximado desde los metadatos de la colección, escalado por la selectividad conocida del filtro
+# (la selectividad caduca con el TTL de los totales y se vuelve a medir con un conteo exacto)
+async def estimated_count(repo, query: dict) -> int:
+    collection_total = await repo.collection.estimated_document_count()
+    if not query:
+        return collection_total
+    ratio = count_cache.selectivity(repo.collection_name, query)
+    if ratio is None:
+        exact = await exact_count(repo, query)
+        count_cache.set_selectivity(repo.collection_name, query, exact, collection_total)
+        return exact
+    return int(round(collection_total * ratio))
+
+async def count_total(repo, query: dict, total_mode: TotalMode = "exact"):
+    if total_mode == "none":
+        return None
+    if total_mode == "estimated":
+        return await estimated_count(repo, query)
+    if total_mode == "cached":
+        cached = count_cache.get(repo.collection_name, query)
+        if cached is not None:
+            return cached
+    return await exact_count(repo, query)
+
+# Paginación por _id: con cursor la página N cuesta lo mismo que la primera (skip/limit se mantiene por compatibilidad)
+async def paginate(repo, query: dict, skip: int = 0, limit: int = 10, cursor: Optional[str] = None,
+                   total_mode: TotalMode = "exact", projection: dict = None):
+    page_query = dict(query)
+    if cursor:
+        page_query["_id"] = {"$gt": decode_cursor(cursor)}
+        skip = 0
+
+    docs = await repo.find_many(
+        page_query, projection, sort=[("_id", 1)], skip=skip, limit=limit + 1, batch_size=limit + 1
+    )
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1]["id"])
+
+    total = await count_total(repo, query, total_mode)
+    return docs, total, next_cursor
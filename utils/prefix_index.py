@@ -0,0 +1,167 @@
+import heapq
+import sys
+from bisect import bisect_left, insort
+from utils.text import WORD, fold
+
+# Prefijos cortos (1-2 letras) abarcan muchas claves: su top-k se guarda hasta el siguiente cambio
+SHORT_PREFIX = 2
+
+
+class PrefixIndex:
+    """Índice de prefijos en memoria sobre títulos.
+
+    Las claves (cada palabra del título, sin tildes ni mayúsculas) se guardan en un
+    array ordenado para buscar el rango del prefijo con bisect; cada clave apunta a
+    su lista de (-popularidad, id) ya ordenada, así el top-k sale de mezclar solo
+    las cabezas de esas listas. Con varias palabras, la última es el prefijo y las
+    anteriores tienen que estar completas en el título.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._postings = {}
+        self._items = {}
+        self._short_cache = {}
+        self._bytes = None
+
+    def __len__(self):
+        return len(self._items)
+
+    @staticmethod
+    def _keys_for(title: str) -> tuple:
+        return tuple(sys.intern(word) for word in set(WORD.findall(fold(title))))
+
+    def _changed(self):
+        self._short_cache.clear()
+        self._bytes = None
+
+    def _link(self, item_id: str, popularity: float, keys: tuple):
+        for key in keys:
+            postings = self._postings.get(key)
+            if postings is None:
+                insort(self._keys, key)
+                postings = self._postings[key] = []
+            insort(postings, (-popularity, item_id))
+
+    def _unlink(self, item_id: str, popularity: float, keys: tuple):
+        for key in keys:
+            postings = self._postings.get(key)
+            if postings is None:
+                continue
+            pos = bisect_left(postings, (-popularity, item_id))
+            if pos < len(postings) and postings[pos][1] == item_id:
+                del postings[pos]
+            if not postings:
+                del self._postings[key]
+                del self._keys[bisect_left(self._keys, key)]
+
+    def add(self, item_id: str, title: str, popularity: float = 0):
+        self.remove(item_id)
+        keys = self._keys_for(title)
+        self._items[item_id] = (title, popularity, keys)
+        self._link(item_id, popularity, keys)
+        self._changed()
+
+    def remove(self, item_id: str):
+        item = self._items.pop(item_id, None)
+        if item is None:
+            return
+        self._unlink(item_id, item[1], item[2])
+        self._changed()
+
+    def set_popularity(self, item_id: str, popularity: float):
+        item = self._items.get(item_id)
+        if item is None or item[1] == popularity:
+            return
+        self._unlink(item_id, item[1], item[2])
+        self._items[item_id] = (item[0], popularity, item[2])
+        self._link(item_id, popularity, item[2])
+        self._changed()
+
+    # Carga inicial: se ordena una sola vez en lugar de insertar uno a uno
+    def load(self, items):
+        self._postings, self._items = {}, {}
+        for item_id, title, popularity in items:
+            keys = self._keys_for(title)
+            self._items[item_id] = (title, popularity, keys)
+            for key in keys:
+                self._postings.setdefault(key, []).append((-popularity, item_id))
+        for postings in self._postings.values():
+            postings.sort()
+        self._keys = sorted(self._postings)
+        self._changed()
+
+    def suggest(self, prefix: str, limit: int = 10) -> list:
+        words = WORD.findall(fold(prefix))
+        if not words:
+            return []
+        prefix = words.pop()
+        cache_key = (prefix, limit)
+        if not words and cache_key in self._short_cache:
+            return self._short_cache[cache_key]
+
+        lists = []
+        pos = bisect_left(self._keys, prefix)
+        while pos < len(self._keys) and self._keys[pos].startswith(prefix):
+            lists.append(self._postings[self._keys[pos]])
+            pos += 1
+
+        # Un mismo título puede coincidir por varias claves: se descartan repetidos
+        seen, result = set(), []
+        for _, item_id in heapq.merge(*lists):
+            if item_id in seen:
+                continue
+            seen.add(item_id)
+            title, popularity, keys = self._items[item_id]
+            if words and not all(word in keys for word in words):
+                continue
+            result.append({"id": item_id, "title": title, "popularity": popularity})
+            if len(result) == limit:
+                break
+        if not words and len(prefix) <= SHORT_PREFIX:
+            self._short_cache[cache_key] = result
+        return result
+
+    # Tamaño aproximado en bytes (listas, tuplas, cadenas y diccionarios, sin contar dos veces
+    # las cadenas compartidas); se recalcula solo tras un cambio
+    def memory_bytes(self) -> int:
+        if self._bytes is not None:
+            return self._bytes
+        counted = set()
+
+        def size(obj):
+            if id(obj) in counted:
+                return 0
+            counted.add(id(obj))
+            return sys.getsizeof(obj)
+
+        total = size(self._keys) + size(self._postings) + size(self._items)
+        for key, postings in self._postings.items():
+            total += size(key) + size(postings)
+            for entry in postings:
+                total += size(entry) + size(entry[0])
+        for item_id, item in self._items.items():
+            total += size(item_id) + size(item) + size(item[0]) + size(item[1]) + size(item[2])
+        self._bytes = total
+        return total
+
+    def stats(self) -> dict:
+        return {
+            "items": len(self._items),
+            "keys": len(self._keys),
+            "postings": sum(len(p) for p in self._postings.values()),
+            "bytes": self.memory_bytes()
+        }
+
+
+game_suggestions = PrefixIndex()
+
+
+def suggestions_metrics_text() -> str:
+    stats = game_suggestions.stats()
+    lines = []
+    for metric in ("items", "keys", "postings", "bytes"):
+        name = f"prefix_index_{metric}"
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f'{name}{{index="games"}} {stats[metric]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,175 @@
+from datetime import date, datetime, timezone
+from bson import ObjectId
+from utils.mongodb import get_collection
+from utils.cache import count_cache
+
+DEFAULT_BATCH_SIZE = 100
+
+# Colección con un contador de versión por colección (ETags de listados)
+VERSIONS_COLLECTION = "collection_versions"
+
+# Convertir un string a ObjectId (None si no es válido)
+def to_object_id(value):
+    if isinstance(value, ObjectId):
+        return value
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    return None
+
+# BSON no soporta datetime.date: se guarda como datetime a medianoche
+def to_bson(value):
+    if isinstance(value, dict):
+        return {k: to_bson(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_bson(v) for v in value]
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+# Mapear un documento de Mongo a la forma de la API (_id -> id, ObjectId -> str)
+def to_api(doc, exclude=()):
+    if doc is None:
+        return None
+    result = {}
+    for key, value in doc.items():
+        if key in exclude:
+            continue
+        if key == "_id":
+            result["id"] = str(value)
+        elif isinstance(value, ObjectId):
+            result[key] = str(value)
+        else:
+            result[key] = value
+    return result
+
+
+async def collection_version(collection_name: str) -> int:
+    doc = await get_collection(VERSIONS_COLLECTION).find_one({"_id": collection_name})
+    return doc["version"] if doc else 0
+
+async def bump_collection_version(collection_name: str):
+    await get_collection(VERSIONS_COLLECTION).update_one(
+        {"_id": collection_name}, {"$inc": {"version": 1}}, upsert=True
+    )
+
+
+class MongoRepository:
+    """Acceso asíncrono a una colección: CRUD con await y mapeo de ids en un solo lugar.
+
+    Con versioned=True cada documento lleva version/updated_at y cada escritura
+    incrementa la versión de la colección.
+    """
+
+    def __init__(self, collection_name: str, exclude: tuple = (), versioned: bool = False):
+        self.collection_name = collection_name
+        self.exclude = tuple(exclude)
+        self.versioned = versioned
+
+    # La colección se resuelve en cada llamada: el cliente se crea en el lifespan
+    @property
+    def collection(self):
+        return get_collection(self.collection_name)
+
+    def map(self, doc):
+        return to_api(doc, self.exclude)
+
+    async def find_one(self, query: dict, projection: dict = None, raw: bool = False, session=None):
+        doc = await self.collection.find_one(query, projection, session=session)
+        return doc if raw else self.map(doc)
+
+    async def find_by_id(self, doc_id, extra: dict = None, projection: dict = None, raw: bool = False, session=None):
+        oid = to_object_id(doc_id)
+        if oid is None:
+            return None
+        return await self.find_one({"_id": oid, **(extra or {})}, projection, raw=raw, session=session)
+
+    def cursor(self, query: dict, projection: dict = None, sort=None, skip: int = 0,
+               limit: int = 0, batch_size: int = DEFAULT_BATCH_SIZE):
+        cursor = self.collection.find(query, projection).batch_size(batch_size)
+        if sort:
+            cursor = cursor.sort(sort)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    # Iterar un cursor de forma asíncrona por lotes
+    async def iterate(self, query: dict, projection: dict = None, sort=None, skip: int = 0,
+                      limit: int = 0, batch_size: int = DEFAULT_BATCH_SIZE, raw: bool = False):
+        async for doc in self.cursor(query, projection, sort, skip, limit, batch_size):
+            yield doc if raw else self.map(doc)
+
+    async def find_many(self, query: dict, projection: dict = None, sort=None, skip: int = 0,
+                        limit: int = 0, batch_size: int = DEFAULT_BATCH_SIZE, raw: bool = False):
+        return [
+            doc async for doc in self.iterate(query, projection, sort, skip, limit, batch_size, raw)
+        ]
+
+    async def count(self, query: dict) -> int:
+        return await self.collection.count_documents(query)
+
+    def _stamp(self, document: dict) -> dict:
+        if self.versioned:
+            document = {**document, "version": 1, "updated_at": datetime.now(timezone.utc)}
+        return to_bson(document)
+
+    # Toda escritura invalida los totales cacheados (y sube la versión si la colección es versionada)
+    async def _after_write(self):
+        count_cache.invalidate(self.collection_name)
+        if self.versioned:
+            await bump_collection_version(self.collection_name)
+
+    async def insert_one(self, document: dict, session=None) -> str:
+        result = await self.collection.insert_one(self._stamp(document), session=session)
+        await self._after_write()
+        return str(result.inserted_id)
+
+    # Inserción por lotes: los _id se asignan en los dicts recibidos para poder identificar fallos parciales
+    async def insert_many(self, documents: list, ordered: bool = False) -> list:
+        for doc in documents:
+            doc.setdefault("_id", ObjectId())
+        try:
+            await self.collection.insert_many([self._stamp(doc) for doc in documents], ordered=ordered)
+        finally:
+            await self._after_write()
+        return [str(doc["_id"]) for doc in documents]
+
+    def _update_doc(self, update: dict) -> dict:
+        update = to_bson(update)
+        if self.versioned:
+            update["$inc"] = {**update.get("$inc", {}), "version": 1}
+            update["$currentDate"] = {**update.get("$currentDate", {}), "updated_at": True}
+        return update
+
+    async def update_one(self, query: dict, update: dict, **kwargs):
+        result = await self.collection.update_one(query, self._update_doc(update), **kwargs)
+        if result.matched_count or result.upserted_id is not None:
+            await self._after_write()
+        return result
+
+    async def update_many(self, query: dict, update: dict):
+        result = await self.collection.update_many(query, self._update_doc(update))
+        if result.modified_count:
+            await self._after_write()
+        return result
+
+    # Actualiza y devuelve el documento tal como estaba antes (None si no existía)
+    async def find_one_and_update(self, query: dict, update: dict, projection: dict = None, raw: bool = False):
+        doc = await self.collection.find_one_and_update(query, self._update_doc(update), projection=projection)
+        if doc is not None:
+            await self._after_write()
+        return doc if raw else self.map(doc)
+
+    async def delete_one(self, query: dict):
+        result = await self.collection.delete_one(query)
+        if result.deleted_count:
+            await self._after_write()
+        return result
+
+    async def update_by_id(self, doc_id, fields: dict):
+        return await self.update_one({"_id": to_object_id(doc_id)}, {"$set": fields})
+
+    async def aggregate(self, pipeline: list, batch_size: int = DEFAULT_BATCH_SIZE, raw: bool = False):
+        cursor = self.collection.aggregate(pipeline, batchSize=batch_size)
+        return [doc if raw else self.map(doc) async for doc in cursor]
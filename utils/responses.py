@@ -0,0 +1,90 @@
+import asyncio
+import typing
+from datetime import date, datetime
+from functools import lru_cache, wraps
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel
+
+def bson_default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+class BSONJSONResponse(JSONResponse):
+    """Serializa documentos BSON directamente a bytes JSON con orjson (ObjectId, datetime)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=bson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+DATE = "date"
+
+# Forma de un response_model: {campo: forma} para modelos, DATE para fechas, None para el resto
+def model_shape(annotation):
+    origin = typing.get_origin(annotation)
+    if origin is not None:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if origin in (list, typing.List, set, tuple) or len(args) == 1:
+            return model_shape(args[0]) if args else None
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {name: model_shape(field.annotation) for name, field in annotation.model_fields.items()}
+    if annotation is date:
+        return DATE
+    return None
+
+# Filtrar campos según la forma del modelo (sin validar): Mongo devuelve las fechas como datetime
+def apply_shape(value, shape):
+    if shape is None or value is None:
+        return value
+    if isinstance(value, list):
+        return [apply_shape(item, shape) for item in value]
+    if shape == DATE:
+        return value.date() if isinstance(value, datetime) else value
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    if isinstance(value, dict):
+        return {k: apply_shape(v, shape[k]) for k, v in value.items() if k in shape}
+    return value
+
+
+class FastJSONRoute(APIRoute):
+    """Ruta que responde con BSONJSONResponse sin la segunda validación de response_model.
+
+    El response_model se sigue usando para OpenAPI y para filtrar campos.
+    Se activa por router: APIRouter(route_class=FastJSONRoute).
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        shape = model_shape(kwargs.get("response_model"))
+        status_code = kwargs.get("status_code") or 200
+
+        is_async = asyncio.iscoroutinefunction(endpoint)
+
+        @wraps(endpoint)
+        async def fast_endpoint(*args, **kw):
+            if is_async:
+                content = await endpoint(*args, **kw)
+            else:
+                content = await run_in_threadpool(endpoint, *args, **kw)
+            if isinstance(content, Response):
+                return content
+            return BSONJSONResponse(apply_shape(content, shape), status_code=status_code)
+
+        super().__init__(path, fast_endpoint, **kwargs)
+
+@lru_cache(maxsize=None)
+def _shape_of(model):
+    return model_shape(model)
+
+# Respuesta ya filtrada por el modelo, para controladores que necesitan fijar cabeceras
+def model_response(content, model, status_code: int = 200, headers: dict = None) -> BSONJSONResponse:
+    return BSONJSONResponse(apply_shape(content, _shape_of(model)), status_code=status_code, headers=headers)
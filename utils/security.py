@@ -1,5 +1,9 @@
 import os
+import time
+import hashlib
+import threading
 import jwt
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -10,7 +14,7 @@ from functools import wraps
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
-print("SECRET_KEY:", SECRET_KEY)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
 security = HTTPBearer()
 
 def create_jwt_token(
@@ -36,166 +40,142 @@ def create_jwt_token(
     )
     return token
 
-def validateuser(func):
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        request: Request = kwargs.get('request')
-        if not request:
-            raise HTTPException(status_code=400, detail="Request object not found")
 
-        authorization: str = request.headers.get("Authorization")
-        if not authorization:
-            raise HTTPException(status_code=400, detail="Authorization header missing")
+class TokenCache:
+    """LRU acotado de claims ya verificados, indexado por el digest del token.
 
-        try:
-            schema, token = authorization.split()
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid Authorization header format")
+    Cada entrada caduca en el exp del propio token. Un lock protege el OrderedDict:
+    las dependencias síncronas de FastAPI se ejecutan en el threadpool.
+    """
 
-        if schema.lower() != "bearer":
-            raise HTTPException(status_code=400, detail="Invalid auth schema")
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
 
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
 
-            email = payload.get("email")
-            name_profile = payload.get("name_profile")
-            active = payload.get("active")
-            exp = payload.get("exp")
-            user_id = payload.get("id")
+    def get(self, token: str):
+        key = self.digest(token)
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                return None
+            if claims["exp"] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
 
-            if email is None:
-                raise HTTPException(status_code=401, detail="Invalid token")
+    def set(self, token: str, claims: dict):
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
 
-            if datetime.utcfromtimestamp(exp) < datetime.utcnow():
-                raise HTTPException(status_code=401, detail="Expired token")
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
 
-            if not active:
-                raise HTTPException(status_code=401, detail="Inactive user")
 
-            # Attach to request state for use in endpoint
-            request.state.email = email
-            request.state.name_profile = name_profile
-            request.state.id = user_id
+token_cache = TokenCache()
 
-        except PyJWTError:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
+# Verificar firma y expiración (solo en un fallo de caché se ejecuta jwt.decode)
+def decode_jwt_token(token: str) -> dict:
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
 
-        return await func(*args, **kwargs)
-    return wrapper
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+    except PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-def validateadmin(func):
+    if payload.get("email") is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    exp = payload.get("exp")
+    if exp is None or exp <= time.time():
+        raise HTTPException(status_code=401, detail="Expired token")
+
+    claims = {
+        "id": payload.get("id"),
+        "email": payload.get("email"),
+        "name_profile": payload.get("name_profile"),
+        "active": payload.get("active"),
+        "admin": payload.get("admin", False),
+        "exp": exp
+    }
+    token_cache.set(token, claims)
+    return claims
+
+# Reglas de acceso comunes a decoradores y dependencias
+def authorize(token: str, require_admin: bool = False) -> dict:
+    claims = decode_jwt_token(token)
+    if require_admin:
+        if not claims["active"] or not claims["admin"]:
+            raise HTTPException(status_code=401, detail="Inactive user or not admin")
+    elif not claims["active"]:
+        raise HTTPException(status_code=401, detail="Inactive user")
+    return claims
+
+def _bearer_token(request: Request) -> str:
+    authorization: str = request.headers.get("Authorization")
+    if not authorization:
+        raise HTTPException(status_code=400, detail="Authorization header missing")
+
+    try:
+        schema, token = authorization.split()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Authorization header format")
+
+    if schema.lower() != "bearer":
+        raise HTTPException(status_code=400, detail="Invalid auth schema")
+    return token
+
+def _protect(func, require_admin: bool):
     @wraps(func)
     async def wrapper(*args, **kwargs):
         request: Request = kwargs.get('request')
         if not request:
             raise HTTPException(status_code=400, detail="Request object not found")
 
-        authorization: str = request.headers.get("Authorization")
-        if not authorization:
-            raise HTTPException(status_code=400, detail="Authorization header missing")
-
-        try:
-            schema, token = authorization.split()
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid Authorization header format")
-
-        if schema.lower() != "bearer":
-            raise HTTPException(status_code=400, detail="Invalid auth schema")
+        claims = authorize(_bearer_token(request), require_admin)
 
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-
-            email = payload.get("email")
-            name_profile = payload.get("name_profile")
-            active = payload.get("active")
-            admin = payload.get("admin")
-            exp = payload.get("exp")
-            user_id = payload.get("id")
-
-            if email is None:
-                raise HTTPException(status_code=401, detail="Invalid token")
-
-            if datetime.utcfromtimestamp(exp) < datetime.utcnow():
-                raise HTTPException(status_code=401, detail="Expired token")
-
-            if not active or not admin:
-                raise HTTPException(status_code=401, detail="Inactive user or not admin")
-
-            request.state.email = email
-            request.state.name_profile = name_profile
-            request.state.admin = admin
-            request.state.id = user_id
-
-        except PyJWTError:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        # Attach to request state for use in endpoint
+        request.state.email = claims["email"]
+        request.state.name_profile = claims["name_profile"]
+        request.state.admin = claims["admin"]
+        request.state.id = claims["id"]
 
         return await func(*args, **kwargs)
     return wrapper
 
-# FastAPI Dependency Injection versions for use with Depends()
-def validate_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    token = credentials.credentials
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-
-        email = payload.get("email")
-        name_profile = payload.get("name_profile")
-        active = payload.get("active")
-        admin = payload.get("admin", False)
-        exp = payload.get("exp")
-        user_id = payload.get("id")
-
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        if datetime.utcfromtimestamp(exp) < datetime.utcnow():
-            raise HTTPException(status_code=401, detail="Expired token")
-
-        if not active:
-            raise HTTPException(status_code=401, detail="Inactive user")
-
-        return {
-            "id": user_id,
-            "email": email,
-            "name_profile": name_profile,
-            "active": active,
-            "role": "admin" if admin else "user"
-        }
-
-    except PyJWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
-
-def validate_admin(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    token = credentials.credentials
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-
-        email = payload.get("email")
-        name_profile = payload.get("name_profile")
-        active = payload.get("active")
-        admin = payload.get("admin", False)
-        exp = payload.get("exp")
-        user_id = payload.get("id")
-
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
+def validateuser(func):
+    return _protect(func, require_admin=False)
 
-        if datetime.utcfromtimestamp(exp) < datetime.utcnow():
-            raise HTTPException(status_code=401, detail="Expired token")
+def validateadmin(func):
+    return _protect(func, require_admin=True)
 
-        if not active or not admin:
-            raise HTTPException(status_code=401, detail="Inactive user or not admin")
+def _claims_response(claims: dict) -> dict:
+    return {
+        "id": claims["id"],
+        "email": claims["email"],
+        "name_profile": claims["name_profile"],
+        "active": claims["active"],
+        "role": "admin" if claims["admin"] else "user"
+    }
 
-        return {
-            "id": user_id,
-            "email": email,
-            "name_profile": name_profile,
-            "active": active,
-            "role": "admin"
-        }
+# FastAPI Dependency Injection versions for use with Depends()
+# (async: se resuelven en el event loop como los decoradores, sin pasar por el threadpool)
+async def validate_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    return _claims_response(authorize(credentials.credentials))
 
-    except PyJWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
+async def validate_admin(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    return _claims_response(authorize(credentials.credentials, require_admin=True))
 
 __all__ = ["create_jwt_token", "decode_jwt_token", "validate_token", "validate_admin"]
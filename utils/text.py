@@ -0,0 +1,13 @@
+import re
+import unicodedata
+
+WORD = re.compile(r"\w+")
+
+# Minúsculas y sin tildes ("Dragón" -> "dragon")
+def fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+# Palabras normalizadas de un título, para búsquedas por prefijo con índice
+def search_terms(text: str) -> list:
+    return sorted(set(WORD.findall(fold(text))))